@@ -1,8 +1,245 @@
 import torch
 import os
+import queue
+import threading
 import numpy as np
+from collections import deque
 from typing import Optional, Union
 
+from model_bundle import DEFAULT_BUNDLE_DIR, ModelBundle, stt_bundle_name
+
+# Voice-activity detection works on frames of this length
+VAD_FRAME_MS = 30
+# Voiced frames in a row that start an utterance
+SPEECH_START_FRAMES = 3
+# Silence that ends an utterance
+SPEECH_END_SECONDS = 0.6
+# Audio kept from before an utterance starts, so its first sound isn't clipped
+PREROLL_SECONDS = 0.3
+# Speech between partial transcripts
+PARTIAL_INTERVAL_SECONDS = 0.5
+# Longer utterances are cut and finalized, bounding transcription cost
+MAX_UTTERANCE_SECONDS = 15.0
+# Audio over which the lowest frame energy sets the VAD's noise floor
+NOISE_WINDOW_SECONDS = 5.0
+# Blocks the noise window is tracked in
+NOISE_WINDOW_BLOCKS = 10
+
+
+class EnergyVAD:
+    """
+    Lightweight voice-activity detector based on frame energy.
+
+    A frame is speech when its RMS is well above an estimate of the
+    background noise. The estimate follows quieter frames down at once, but
+    only rises to the lowest frame RMS seen over the last noise_window
+    seconds (minimum statistics), and never while the caller reports an
+    utterance in progress. The pauses between words keep that minimum at
+    the real background, so long speech doesn't raise the floor, while noise
+    that stays loud for a whole window stops counting as speech. The first
+    calibration_ms of audio only seeds the estimate.
+
+    Args:
+        sample_rate: Audio sample rate
+        frame_ms: Frame length in milliseconds
+        threshold: How many times the noise floor a frame's RMS must reach
+        min_rms: RMS below which a frame is never speech
+        noise_decay: Weight of the old noise floor when a frame is quieter
+        noise_window: Seconds of audio the floor's minimum is taken over
+        calibration_ms: Initial audio used to seed the noise floor, never
+            reported as speech
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = VAD_FRAME_MS,
+                 threshold: float = 3.0, min_rms: float = 0.005, noise_decay: float = 0.9,
+                 noise_window: float = NOISE_WINDOW_SECONDS, calibration_ms: int = 300):
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.threshold = threshold
+        self.min_rms = min_rms
+        self.noise_decay = noise_decay
+        self.noise = min_rms
+        # The window is kept as the minima of NOISE_WINDOW_BLOCKS blocks of frames
+        window_frames = max(NOISE_WINDOW_BLOCKS, round(noise_window * 1000 / frame_ms))
+        self._block_frames = window_frames // NOISE_WINDOW_BLOCKS
+        self._block_minima = deque(maxlen=NOISE_WINDOW_BLOCKS)
+        self._block_min = float("inf")
+        self._block_count = 0
+        self._calibration_frames = calibration_ms // frame_ms
+        # RMS of the calibration frames seen so far, or None once calibrated
+        self._calibration = [] if self._calibration_frames else None
+
+    def is_speech(self, frame: np.ndarray, in_utterance: bool = False) -> bool:
+        """
+        Classify a frame and update the noise floor.
+
+        Args:
+            frame: frame_size float samples
+            in_utterance: Whether the caller has an utterance open; the
+                floor doesn't rise until it ends
+        """
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        if self._calibration is not None:
+            self._calibration.append(rms)
+            if len(self._calibration) >= self._calibration_frames:
+                self.noise = max(self.min_rms, float(np.median(self._calibration)))
+                self._calibration = None
+            return False
+        speech = rms > max(self.min_rms, self.noise * self.threshold)
+
+        self._block_min = min(self._block_min, rms)
+        self._block_count += 1
+        if self._block_count == self._block_frames:
+            self._block_minima.append(self._block_min)
+            self._block_min = float("inf")
+            self._block_count = 0
+
+        if rms < self.noise:
+            self.noise = self.noise_decay * self.noise + (1 - self.noise_decay) * rms
+        elif not in_utterance and len(self._block_minima) == NOISE_WINDOW_BLOCKS:
+            # Every frame of the last window was at least this loud
+            self.noise = max(self.noise, min(self._block_minima))
+        return speech
+
+
+class Transcript:
+    """
+    A partial or final transcript of one utterance.
+
+    Attributes:
+        text: The transcribed text
+        final: False while the utterance is still going on
+        start, end: Utterance bounds in seconds since the stream began
+    """
+
+    __slots__ = ("text", "final", "start", "end")
+
+    def __init__(self, text: str, final: bool, start: float, end: float):
+        self.text = text
+        self.final = final
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        kind = "final" if self.final else "partial"
+        return f"Transcript({kind}, {self.start:.2f}-{self.end:.2f}s, {self.text!r})"
+
+
+class StreamingTranscriber:
+    """
+    Turns a live stream of audio chunks into per-utterance transcripts.
+
+    Chunks are cut into VAD frames. Once speech starts, the utterance so far
+    is transcribed every partial_interval seconds of audio, so text arrives
+    while the speaker is still talking. After end_silence seconds of silence
+    the whole utterance is transcribed once more as the final transcript.
+
+    Args:
+        stt: The SileroSTT doing the transcription
+        vad: Object with frame_size and is_speech(frame, in_utterance);
+            defaults to EnergyVAD
+        partial_interval: Seconds of new speech between partial transcripts
+        end_silence: Seconds of silence that end an utterance
+        max_utterance: Seconds after which an utterance is finalized anyway
+    """
+
+    def __init__(self, stt, vad=None, partial_interval: float = PARTIAL_INTERVAL_SECONDS,
+                 end_silence: float = SPEECH_END_SECONDS, max_utterance: float = MAX_UTTERANCE_SECONDS):
+        self.stt = stt
+        self.sample_rate = stt.sample_rate
+        self.vad = vad if vad is not None else EnergyVAD(self.sample_rate)
+        frame_seconds = self.vad.frame_size / self.sample_rate
+        self.end_frames = max(1, round(end_silence / frame_seconds))
+        self.max_frames = max(1, round(max_utterance / frame_seconds))
+        self.partial_samples = int(partial_interval * self.sample_rate)
+        self._pending = np.zeros(0, dtype=np.float32)  # Samples short of a whole frame
+        self._preroll = deque(maxlen=max(SPEECH_START_FRAMES, round(PREROLL_SECONDS / frame_seconds)))
+        self._utterance = None    # Frames of the utterance in progress
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._since_partial = 0
+        self._last_partial = ""
+        self._start_sample = 0
+        self._samples = 0         # Samples seen since the stream began
+
+    def feed(self, chunk: np.ndarray, partials: bool = True):
+        """
+        Add a chunk of audio at the STT sample rate.
+
+        Args:
+            chunk: int16 or float samples, mono, shaped (n,) or (n, 1)
+            partials: Whether a partial transcript may be made for this
+                chunk; pass False to skip them while catching up on a backlog
+
+        Returns:
+            list: Transcript events the chunk completed, oldest first
+        """
+        chunk = np.asarray(chunk).reshape(-1)
+        if chunk.dtype == np.int16:
+            chunk = chunk.astype(np.float32) / 32768
+        audio = np.concatenate((self._pending, chunk.astype(np.float32, copy=False)))
+        size = self.vad.frame_size
+        whole = len(audio) - len(audio) % size
+        self._pending = audio[whole:]
+
+        events = []
+        for start in range(0, whole, size):
+            frame = audio[start:start + size]
+            self._samples += size
+            event = self._frame(frame, self.vad.is_speech(frame, self._utterance is not None))
+            if event is not None:
+                events.append(event)
+        if (partials and self._utterance is not None and self._since_partial >= self.partial_samples):
+            self._since_partial = 0
+            text = self._transcribe()
+            if text and text != self._last_partial:
+                self._last_partial = text
+                events.append(Transcript(text, False, self._start_sample / self.sample_rate,
+                                         self._samples / self.sample_rate))
+        return events
+
+    def _frame(self, frame, speech):
+        if self._utterance is None:
+            self._preroll.append(frame)
+            self._voiced_run = self._voiced_run + 1 if speech else 0
+            if self._voiced_run >= SPEECH_START_FRAMES:
+                self._utterance = list(self._preroll)
+                self._preroll.clear()
+                self._start_sample = self._samples - len(self._utterance) * len(frame)
+                self._silent_run = 0
+                self._since_partial = len(self._utterance) * len(frame)
+            return None
+        self._utterance.append(frame)
+        self._since_partial += len(frame)
+        self._silent_run = 0 if speech else self._silent_run + 1
+        if self._silent_run >= self.end_frames or len(self._utterance) >= self.max_frames:
+            return self._finish()
+        return None
+
+    def _finish(self):
+        text = self._transcribe()
+        end = self._samples / self.sample_rate
+        start = self._start_sample / self.sample_rate
+        self._utterance = None
+        self._voiced_run = 0
+        self._last_partial = ""
+        return Transcript(text, True, start, end) if text else None
+
+    def _transcribe(self) -> str:
+        audio = torch.from_numpy(np.concatenate(self._utterance)).unsqueeze(0)
+        return self.stt.decoder(self.stt._infer(audio).cpu())
+
+    def flush(self):
+        """
+        Finalize the utterance in progress, e.g. when the stream ends.
+
+        Returns:
+            list: The final Transcript, if there was speech
+        """
+        if self._utterance is None:
+            return []
+        event = self._finish()
+        return [event] if event is not None else []
+
 class SileroSTT:
     """
     A CPU-only wrapper class for Silero Speech-to-Text model.
@@ -15,19 +252,54 @@ class SileroSTT:
         sample_rate: Audio sample rate expected by the model
     """
     
-    def __init__(self, language: str = 'en'):
+    def __init__(self, language: str = 'en', bundle_dir: Optional[str] = None, lazy: bool = True):
         """
         Initialize the Silero STT model (CPU only).
         
         Args:
             language: Language code ('en', 'de', 'es', etc.)
+            bundle_dir: Offline model bundle checked before torch.hub
+            lazy: Defer loading the model until the first transcription
         """
         self.device = torch.device('cpu')  # Force CPU
         self.sample_rate = 16000  # Silero models typically use 16kHz
-        self.model = self._load_model(language)
-        
+        self.language = language
+        self.bundle = ModelBundle(bundle_dir or DEFAULT_BUNDLE_DIR)
+        self.model = None
+        self._load_thread = None  # Background preload, while one runs
+        if not lazy:
+            self.model = self._load_model(language)
+
+    def preload(self, background: bool = True):
+        """
+        Load the model now instead of on the first transcription.
+
+        Args:
+            background: Load on a daemon thread and return at once; the
+                first transcription waits for it to finish.
+        """
+        if not background:
+            self._ensure_model()
+        elif self._load_thread is None:
+            self._load_thread = threading.Thread(target=self._ensure_model, daemon=True)
+            self._load_thread.start()
+
+    def _ensure_model(self):
+        thread = self._load_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._load_thread = None
+        if self.model is None:
+            self.model = self._load_model(self.language)
+
     def _load_model(self, language: str):
         """Load the Silero STT model and utility functions (CPU only)."""
+        bundle_name = stt_bundle_name(language)
+        if bundle_name in self.bundle:
+            # Pinned local files: no hub lookup and no network
+            model, self.decoder, utils = self.bundle.load_stt(bundle_name, self.device)
+            self.read_batch, _, _, self.prepare_model_input = utils
+            return model
         try:
             torch.hub._validate_not_a_forked_repo = lambda a, b, c: True
             result = torch.hub.load(
@@ -71,6 +343,7 @@ class SileroSTT:
         Returns:
             Transcribed text
         """
+        self._ensure_model()
         if audio_type == 'file':
             if not os.path.exists(audio):
                 raise FileNotFoundError(f"Audio file not found: {audio}")
@@ -106,13 +379,18 @@ class SileroSTT:
             raise ValueError(f"Invalid tensor shape: {audio_tensor.shape}. Expected 2 dimensions.")
 
         # Run inference
-        with torch.no_grad():
-            output = self.model(audio_tensor.to(self.device))
-            print(f"Debug: Model output shape: {output.shape}")  # Debug: Inspect model output shape
+        output = self._infer(audio_tensor)
+        print(f"Debug: Model output shape: {output.shape}")  # Debug: Inspect model output shape
         
         # Decode output using the decoder object
         return self.decoder(output.cpu())
     
+    def _infer(self, audio_tensor: torch.Tensor) -> torch.Tensor:
+        """Run the model on a (batch size, sequence length) tensor."""
+        self._ensure_model()
+        with torch.no_grad():
+            return self.model(audio_tensor.to(self.device))
+
     def _transcribe_numpy(self, audio_np: np.ndarray) -> str:
         """Transcribe audio from numpy array."""
         audio_tensor = torch.from_numpy(audio_np).float().to(self.device)
@@ -122,3 +400,44 @@ class SileroSTT:
                  audio_type: str = 'file') -> str:
         """Alias for transcribe method."""
         return self.transcribe(audio, audio_type)
+
+    def transcriber(self, **kwargs) -> StreamingTranscriber:
+        """
+        A StreamingTranscriber for feeding audio chunks by hand, e.g. from
+        an existing sounddevice.InputStream callback. Keyword arguments go
+        to StreamingTranscriber.
+        """
+        self._ensure_model()
+        return StreamingTranscriber(self, **kwargs)
+
+    def listen(self, blocksize: int = 1600, device=None, **kwargs):
+        """
+        Transcribe the microphone live.
+
+        The input stream's callback only queues audio; VAD and transcription
+        run in the caller's thread while recording continues. Partial
+        transcripts are skipped whenever audio is waiting, so a slow model
+        falls behind on partials rather than on finals.
+
+        Args:
+            blocksize: Samples per input chunk (1600 is 100 ms at 16 kHz)
+            device: sounddevice input device
+            **kwargs: Passed to StreamingTranscriber
+
+        Yields:
+            Transcript: Partial and final transcripts, until the generator is closed
+        """
+        import sounddevice as sd
+        transcriber = self.transcriber(**kwargs)
+        chunks = queue.Queue()
+
+        def callback(indata, frames, time_info, status):
+            if status:
+                print(f"Input status: {status}")
+            chunks.put(indata[:, 0].copy())
+
+        with sd.InputStream(samplerate=self.sample_rate, channels=1, dtype='float32',
+                            blocksize=blocksize, device=device, callback=callback):
+            while True:
+                chunk = chunks.get()
+                yield from transcriber.feed(chunk, partials=chunks.empty())
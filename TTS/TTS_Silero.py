@@ -1,7 +1,492 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
 import torch
 import numpy as np
 from typing import Optional
 
+from model_bundle import DEFAULT_BUNDLE_DIR, ModelBundle, tts_bundle_name
+
+# The official Silero models, which offline bundles hold
+DEFAULT_MODEL_REPO = "snakers4/silero-models"
+DEFAULT_MODEL_NAME = "silero_tts"
+
+# Default memory budget for loaded TTS models kept around by the registry
+DEFAULT_MODEL_CACHE_BYTES = 2 * 1024 ** 3
+# Longest piece of text passed to apply_tts in one call when streaming
+MAX_CHUNK_CHARS = 800
+# Synthesized chunks allowed to wait for playback while streaming
+STREAM_QUEUE_SIZE = 2
+# Jobs handed to a save_many worker at a time
+BATCH_CHUNK_SIZE = 8
+# Output encodings for save(): name -> (soundfile format, subtype)
+ENCODINGS = {
+    "pcm16": ("WAV", "PCM_16"),
+    "float32": ("WAV", "FLOAT"),
+    "flac": ("FLAC", "PCM_16"),
+    "ogg": ("OGG", "VORBIS"),
+}
+# Encoding used when none is given, by file extension
+EXTENSION_ENCODINGS = {".flac": "flac", ".ogg": "ogg"}
+# CPU optimizations applied to a loaded model: None (eager), "quantize" or "freeze"
+CPU_MODES = (None, "quantize", "freeze")
+# Short text synthesized at load to warm the model up, and for RTF measurements
+WARMUP_TEXT = "Hello, this is a warmup sentence for the speech model."
+# Upper edges of the synthesis latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+# Recent calls kept for latency percentiles
+METRICS_WINDOW = 1000
+# Default sizes for the synthesized-audio cache
+DEFAULT_AUDIO_CACHE_MEMORY_BYTES = 64 * 1024 ** 2
+DEFAULT_AUDIO_CACHE_DISK_BYTES = 512 * 1024 ** 2
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;:…])\s+|\n+")
+
+
+def split_sentences(text: str, max_chars: int = MAX_CHUNK_CHARS):
+    """
+    Split text into sentences, breaking any longer than max_chars at spaces.
+
+    Returns:
+        list: Non-empty pieces of text in order.
+    """
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample audio with a polyphase filter; returns audio unchanged if the rates match."""
+    if source_rate == target_rate:
+        return audio
+    from math import gcd
+    from scipy.signal import resample_poly
+    divisor = gcd(source_rate, target_rate)
+    return resample_poly(audio, target_rate // divisor, source_rate // divisor).astype(np.float32)
+
+
+class StreamResampler:
+    """
+    Resample audio that arrives in chunks, matching a one-shot resample().
+
+    Each chunk is resampled together with enough earlier input to cover the
+    filter, and output is only emitted once the input it depends on has
+    arrived, so chunk edges leave no clicks and output length doesn't drift.
+    The last outputs wait for flush().
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        from math import gcd
+        divisor = gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.half_len = 10 * max(self.up, self.down)  # resample_poly's filter half length
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.start = 0     # Input index of buffer[0]; a multiple of down, so output grids line up
+        self.emitted = 0   # Output samples returned so far
+
+    def _resample(self, end: int) -> np.ndarray:
+        from scipy.signal import resample_poly
+        if end <= self.emitted:
+            return np.zeros(0, dtype=np.float32)
+        out = resample_poly(self.buffer, self.up, self.down)
+        first = self.start * self.up // self.down
+        out = out[self.emitted - first:end - first].astype(np.float32)
+        self.emitted = end
+        return out
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        if self.up == self.down:
+            return chunk
+        self.buffer = np.concatenate((self.buffer, chunk))
+        total = self.start + len(self.buffer)
+        # Outputs whose filter window ends before the last input sample
+        ready = max(self.emitted, ((total - 1) * self.up - self.half_len) // self.down + 1)
+        out = self._resample(ready)
+        # Drop input no later output can reach, keeping start a multiple of down
+        needed = (self.emitted * self.down - self.half_len) // self.up - 1
+        start = max(self.start, needed - needed % self.down)
+        self.buffer = self.buffer[start - self.start:]
+        self.start = start
+        return out
+
+    def flush(self) -> np.ndarray:
+        """Return the outputs that depend on the end of the input."""
+        if self.up == self.down:
+            return np.zeros(0, dtype=np.float32)
+        total = self.start + len(self.buffer)
+        return self._resample(-(-total * self.up // self.down))
+
+
+def set_cpu_threads(intra_threads: int = None, inter_threads: int = None):
+    """
+    Set torch's intra-op and inter-op thread counts.
+
+    The inter-op pool can only be sized before torch first uses it, so a
+    late call keeps the current size and says so.
+    """
+    if intra_threads:
+        torch.set_num_threads(intra_threads)
+    if inter_threads:
+        try:
+            torch.set_num_interop_threads(inter_threads)
+        except RuntimeError as e:
+            print(f"Could not set inter-op threads: {e}")
+
+
+def optimize_for_cpu(model, mode: str = None):
+    """
+    Apply a CPU optimization to a Silero model in place.
+
+    "quantize" applies int8 dynamic quantization to Linear (and, on eager
+    modules, LSTM) layers; "freeze" freezes the TorchScript module, inlining
+    weights and folding constants. Silero wraps its TorchScript network as
+    ``model.model``, so that is what gets optimized. A mode that doesn't
+    apply to the model, or that leaves it unchanged, is reported and
+    skipped; the mode that took effect is kept as ``applied_cpu_mode`` on
+    wrapped models.
+
+    Returns:
+        The model.
+    """
+    if mode is None:
+        return model
+    if mode not in CPU_MODES:
+        raise ValueError(f"Unsupported CPU mode: {mode}. Use one of {CPU_MODES}")
+    wrapped = hasattr(model, "model")
+    network = model.model if wrapped else model
+    try:
+        if mode == "quantize":
+            network = _quantize(network)
+            if network is None:
+                print("Found no layers to quantize, keeping the model as is")
+                return model
+        else:
+            network = torch.jit.freeze(network.eval())
+    except Exception as e:
+        print(f"Could not apply {mode} to the model, keeping it as is: {e}")
+        return model
+    if not wrapped:
+        return network
+    model.model = network
+    model.applied_cpu_mode = mode
+    return model
+
+
+def _quantize(network):
+    """
+    Dynamically quantize a network to int8.
+
+    TorchScript modules go through the JIT quantization passes, since the
+    eager pass only swaps nn.Linear/nn.LSTM instances and would return a
+    scripted module untouched.
+
+    Returns:
+        The quantized network, or None when no layer was quantized.
+    """
+    if isinstance(network, torch.jit.ScriptModule):
+        from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic_jit
+        network = quantize_dynamic_jit(network.eval(), {"": default_dynamic_qconfig})
+        quantized = any(op.startswith("quantized::") for op in torch.jit.export_opnames(network))
+    else:
+        network = torch.quantization.quantize_dynamic(network, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8)
+        quantized = any(type(module).__module__.startswith("torch.ao.nn.quantized") for module in network.modules())
+    return network if quantized else None
+
+
+def model_nbytes(model) -> int:
+    """
+    Estimate the memory held by a model's parameters and buffers.
+
+    Silero TTS models wrap a TorchScript module in a plain object, so the
+    wrapped ``.model`` is checked too. Returns 0 when nothing can be measured.
+    """
+    for candidate in (model, getattr(model, "model", None)):
+        if candidate is not None and callable(getattr(candidate, "parameters", None)):
+            tensors = list(candidate.parameters()) + list(candidate.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+    return 0
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded TTS models.
+
+    Models are keyed by (repo, model_name, language, variant, CPU mode, device), so
+    switching between recently used voices is a dictionary lookup instead
+    of a torch.hub.load. Least recently used models are dropped once their
+    combined size exceeds max_bytes; the most recent one is always kept.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MODEL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._models = OrderedDict()  # key -> (model, utils, size in bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader):
+        """
+        Return (model, utils) for key, calling loader() to load it on a miss.
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry[0], entry[1]
+            self.misses += 1
+            model, utils = loader()
+            self._models[key] = (model, utils, model_nbytes(model))
+            self._evict()
+            return model, utils
+
+    def _evict(self):
+        while len(self._models) > 1 and self.nbytes() > self.max_bytes:
+            key, _ = self._models.popitem(last=False)
+            print(f"Unloaded TTS model {key}")
+            if key[-1].startswith("cuda"):
+                torch.cuda.empty_cache()
+
+    def nbytes(self) -> int:
+        return sum(entry[2] for entry in self._models.values())
+
+    def keys(self):
+        with self._lock:
+            return list(self._models)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+class AudioCache:
+    """
+    Content-addressed cache of synthesized audio, in memory and optionally on disk.
+
+    Entries are keyed by a hash of everything that affects the audio and
+    stored as int16, a quarter of the float32 size. Both tiers evict least
+    recently used entries once they exceed their byte budget. Disk entries
+    are ``<hash>.npy`` files, and a hit refreshes the file's mtime, so the
+    LRU order survives restarts.
+
+    Args:
+        directory (str): Folder for the disk tier; None keeps the cache in memory only.
+        memory_bytes (int): Budget for the in-memory tier.
+        disk_bytes (int): Budget for the disk tier.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 memory_bytes: int = DEFAULT_AUDIO_CACHE_MEMORY_BYTES,
+                 disk_bytes: int = DEFAULT_AUDIO_CACHE_DISK_BYTES):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()  # key -> int16 audio
+        self._memory_size = 0
+        self._disk = OrderedDict()    # key -> file size, least recently used first
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(directory):
+                if name.endswith(".npy"):
+                    stat = os.stat(os.path.join(directory, name))
+                    entries.append((stat.st_mtime, name[:-4], stat.st_size))
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_size += size
+
+    @staticmethod
+    def key(**fields) -> str:
+        """Hash the fields that determine the synthesized audio."""
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return cached float32 audio for key, or None."""
+        with self._lock:
+            pcm = self._memory.get(key)
+            if pcm is not None:
+                self._memory.move_to_end(key)
+            elif key in self._disk:
+                try:
+                    pcm = np.load(self._path(key))
+                    os.utime(self._path(key))
+                except OSError:
+                    self._disk_size -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._remember(key, pcm)
+            if pcm is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pcm.astype(np.float32) / 32767.0
+
+    def put(self, key: str, audio: np.ndarray):
+        """Store float32 audio under key."""
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype(np.int16)
+        with self._lock:
+            self._remember(key, pcm)
+            if self.directory and key not in self._disk:
+                np.save(self._path(key), pcm)
+                self._disk[key] = os.path.getsize(self._path(key))
+                self._disk_size += self._disk[key]
+                while len(self._disk) > 1 and self._disk_size > self.disk_bytes:
+                    old, size = self._disk.popitem(last=False)
+                    self._disk_size -= size
+                    try:
+                        os.remove(self._path(old))
+                    except OSError:
+                        pass
+
+    def _remember(self, key: str, pcm: np.ndarray):
+        if key in self._memory:
+            return
+        self._memory[key] = pcm
+        self._memory_size += pcm.nbytes
+        while len(self._memory) > 1 and self._memory_size > self.memory_bytes:
+            _, old = self._memory.popitem(last=False)
+            self._memory_size -= old.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            for key in self._disk:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._disk.clear()
+            self._disk_size = 0
+
+# The SileroTTS each save_many worker process loads once and reuses
+_worker_tts = None
+
+
+def _batch_worker_init(config: dict, threads: int):
+    global _worker_tts
+    torch.set_num_threads(threads)
+    _worker_tts = SileroTTS(**config)
+    _worker_tts.preload(background=False)
+
+
+def _batch_worker_run(jobs, audio_kwargs: dict) -> float:
+    """
+    Synthesize and save a chunk of (text, speaker, filename) jobs.
+
+    Files are written on a separate thread, so writing one file overlaps
+    with synthesizing the next.
+
+    Returns:
+        float: Seconds of audio written.
+    """
+    import soundfile as sf
+    sample_rate = audio_kwargs.get("sample_rate", 48000)
+    seconds = 0.0
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        writes = []
+        for text, speaker, filename in jobs:
+            audio = _worker_tts.audio(text=text, speaker=speaker, **audio_kwargs)
+            writes.append(writer.submit(sf.write, filename, audio, sample_rate))
+            seconds += len(audio) / sample_rate
+        for write in writes:
+            write.result()
+    return seconds
+
+
+def format_size(num_bytes):
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if num_bytes < 1024.0:
+            return f"{num_bytes:.2f} {unit}"
+        num_bytes /= 1024.0
+    return f"{num_bytes:.2f} PB"
+
+
+class TTSMetrics:
+    """
+    Running synthesis statistics: call latencies, real-time factor and throughput.
+
+    Latencies go into fixed LATENCY_BUCKETS_MS buckets for the lifetime of
+    the process, plus a window of the last METRICS_WINDOW calls for
+    percentiles. Cache hits are counted but not timed as synthesis.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+        self.recent = deque(maxlen=window)
+        self.calls = 0
+        self.cache_hits = 0
+        self.chars = 0
+        self.synth_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    def record(self, seconds: float, chars: int, audio_seconds: float):
+        """Record one synthesis call."""
+        ms = seconds * 1000.0
+        with self._lock:
+            self.buckets[next(i for i, edge in enumerate(LATENCY_BUCKETS_MS) if ms <= edge)] += 1
+            self.recent.append(ms)
+            self.calls += 1
+            self.chars += chars
+            self.synth_seconds += seconds
+            self.audio_seconds += audio_seconds
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the statistics.
+
+        Returns:
+            dict: calls, cache_hits, latency percentiles (ms) over the recent
+            window, the cumulative histogram (bucket edge -> count),
+            real_time_factor and chars_per_second.
+        """
+        with self._lock:
+            recent = sorted(self.recent)
+            def percentile(pct):
+                return recent[min(len(recent) - 1, int(pct / 100 * len(recent)))] if recent else None
+            return {
+                "calls": self.calls,
+                "cache_hits": self.cache_hits,
+                "latency_ms": {"p50": percentile(50), "p95": percentile(95), "p99": percentile(99),
+                               "max": recent[-1] if recent else None},
+                "latency_histogram_ms": {str(edge): count for edge, count in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                "real_time_factor": self.synth_seconds / self.audio_seconds if self.audio_seconds else None,
+                "chars_per_second": self.chars / self.synth_seconds if self.synth_seconds else None,
+                "audio_seconds": self.audio_seconds,
+            }
+
 
 class SileroTTS:
     def __init__(
@@ -9,9 +494,29 @@ class SileroTTS:
         model_variant: str = "v3_en", 
         language: str = "en", 
         speaker: str = "en_1",
-        model_repo: str = "snakers4/silero-models",
-        model_name: str = "silero_tts"
+        model_repo: str = DEFAULT_MODEL_REPO,
+        model_name: str = DEFAULT_MODEL_NAME,
+        registry: Optional[ModelRegistry] = None,
+        cache: Optional[AudioCache] = None,
+        cpu_mode: str = None,
+        intra_threads: int = None,
+        inter_threads: int = None,
+        warmup: bool = None,
+        bundle_dir: str = None,
+        lazy: bool = True
     ):
+        """
+        Args:
+            cpu_mode (str): CPU optimization from CPU_MODES applied at load.
+            intra_threads (int): torch intra-op threads.
+            inter_threads (int): torch inter-op threads.
+            warmup (bool): Synthesize WARMUP_TEXT at load so the first real
+                call doesn't pay for it; defaults to on when cpu_mode is set.
+            bundle_dir (str): Offline model bundle checked before torch.hub;
+                defaults to DEFAULT_BUNDLE_DIR.
+            lazy (bool): Defer loading the model until the first synthesis;
+                call preload() to load it ahead of time.
+        """
         # Select device in order: GPU, Metal, CPU
         if torch.cuda.is_available():
             device = torch.device("cuda")
@@ -29,30 +534,86 @@ class SileroTTS:
         self.model = None
         self.speed = 1.0
         self._utils = None
-        # Load the model with the specified parameters
-        self.load_model(model_repo=model_repo, model_name=model_name)
+        self.model_repo = model_repo
+        self.model_name = model_name
+        self.registry = registry if registry is not None else MODEL_REGISTRY
+        self.cache = cache  # Optional AudioCache consulted before the model
+        self._model_stale = False  # Language or variant changed since the model was loaded
+        self.cpu_mode = cpu_mode if device.type == "cpu" else None
+        self.warmup = cpu_mode is not None if warmup is None else warmup
+        self.metrics = TTSMetrics()
+        self._metrics_stop = None  # Event stopping the periodic metrics log, while one runs
+        self.bundle = ModelBundle(bundle_dir or DEFAULT_BUNDLE_DIR)
+        self._load_thread = None  # Background preload, while one runs
+        set_cpu_threads(intra_threads, inter_threads)
+        if not lazy:
+            self.load_model(model_repo=model_repo, model_name=model_name)
+
+    def _model_key(self, model_repo: str, model_name: str):
+        return (model_repo, model_name, self.language, self.model_variant, self.cpu_mode, str(self.device))
+
+    def _hub_load(self, model_repo: str, model_name: str, **kwargs):
+        model, utils = torch.hub.load(
+            repo_or_dir=model_repo,
+            model=model_name,
+            language=self.language,
+            speaker=self.model_variant,
+            device=self.device,
+            **kwargs
+        )
+        return self._prepare(model, utils)
+
+    def _bundle_load(self, name: str):
+        return self._prepare(*self.bundle.load_tts(name, self.device))
+
+    def _prepare(self, model, utils):
+        model = optimize_for_cpu(model, self.cpu_mode)
+        if self.warmup:
+            start = time.perf_counter()
+            model.apply_tts(text=WARMUP_TEXT, speaker=model.speakers[0], sample_rate=48000)
+            print(f"Warmed up in {time.perf_counter() - start:.2f} s")
+        return model, utils
 
-    def load_model(self, model_repo: str = "snakers4/silero-models", model_name: str = "silero_tts"):
+    def load_model(self, model_repo: str = None, model_name: str = None):
         """
         Load a TTS model with flexible parameters.
-        
+
+        Models come from the shared registry, so a model already loaded for
+        this repo, name, language, variant, CPU mode and device is reused.
+        When the official model is asked for and the offline bundle holds
+        the variant, it is loaded from there and torch.hub is never touched.
+
         Args:
             model_repo (str): Repository name containing the model
             model_name (str): Name of the model to load
         """
+        model_repo = model_repo or self.model_repo
+        model_name = model_name or self.model_name
+        bundle_name = tts_bundle_name(self.model_variant)
+        official = (model_repo, model_name) == (DEFAULT_MODEL_REPO, DEFAULT_MODEL_NAME)
+        if official and bundle_name in self.bundle:
+            # A corrupt bundle raises BundleError rather than quietly going online
+            self.model, self._utils = self.registry.get(
+                self._model_key(self.bundle.directory, bundle_name),
+                lambda: self._bundle_load(bundle_name)
+            )
+            self.model_repo, self.model_name = model_repo, model_name
+            self._model_stale = False
+            print(f"Loaded {bundle_name} from bundle {self.bundle.directory}")
+            return
         try:
             # Load the Silero TTS model with the correct parameters
-            self.model, utils = torch.hub.load(
-                repo_or_dir=model_repo,
-                model=model_name,
-                language=self.language,
-                speaker=self.model_variant,
-                device=self.device,
-                trust_repo=True  # Add trust_repo flag for external repositories
+            self.model, utils = self.registry.get(
+                self._model_key(model_repo, model_name),
+                # Add trust_repo flag for external repositories
+                lambda: self._hub_load(model_repo, model_name, trust_repo=True)
             )
             
             # Store available speakers and utils for later use
             self._utils = utils
+            self.model_repo = model_repo
+            self.model_name = model_name
+            self._model_stale = False
             print(f"Successfully loaded model from {model_repo}/{model_name}")
             print(f"Available speakers: {self.model.speakers}")
             
@@ -60,15 +621,81 @@ class SileroTTS:
             print(f"Error loading model: {str(e)}")
             print("Falling back to default model...")
             # Fallback to default model
-            self.model, utils = torch.hub.load(
-                "snakers4/silero-models",
-                "silero_tts",
-                language=self.language,
-                speaker=self.model_variant,
-                device=self.device,
+            self.model_repo, self.model_name = DEFAULT_MODEL_REPO, DEFAULT_MODEL_NAME
+            self.model, self._utils = self.registry.get(
+                self._model_key(self.model_repo, self.model_name),
+                lambda: self._hub_load(self.model_repo, self.model_name)
             )
+            self._model_stale = False
+
+    def preload(self, background: bool = True):
+        """
+        Load the model now instead of on the first synthesis.
+
+        Args:
+            background (bool): Load on a daemon thread and return at once;
+                the first synthesis waits for it to finish.
+        """
+        if not background:
+            self._ensure_model()
+        elif self._load_thread is None:
+            self._load_thread = threading.Thread(target=self.load_model, daemon=True)
+            self._load_thread.start()
+
+    def _ensure_model(self):
+        if self._load_thread is not None:
+            self._load_thread.join()
+            self._load_thread = None
+        if not self.model or self._model_stale:
+            self.load_model()
+
+    def real_time_factor(self, text: str = WARMUP_TEXT, runs: int = 3, sample_rate: int = 48000) -> float:
+        """
+        Measure synthesis time divided by audio duration; below 1 is faster than real time.
+
+        Calls the model directly, so the audio cache doesn't affect the result.
+        """
+        self._ensure_model()
+        speaker = self.speaker if self.speaker in self.model.speakers else self.model.speakers[0]
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            audio = self.model.apply_tts(text=text, speaker=speaker, sample_rate=sample_rate)
+            rtf = (time.perf_counter() - start) / (len(audio) / sample_rate)
+            best = rtf if best is None else min(best, rtf)
+        return best
+
+    def compare_cpu_modes(self, modes=CPU_MODES, **kwargs) -> dict:
+        """
+        Report the real-time factor of each CPU mode on this host.
+
+        Each mode is loaded and warmed up before it is measured; the
+        instance is switched back to its own mode afterwards. Extra keyword
+        arguments go to real_time_factor().
+
+        Returns:
+            dict: mode -> real-time factor, or None for a mode that
+            couldn't be applied to this model.
+        """
+        original = (self.cpu_mode, self.warmup)
+        results = {}
+        try:
+            for mode in modes:
+                self.cpu_mode, self.warmup = mode, True
+                self.load_model()
+                if mode is not None and getattr(self.model, "applied_cpu_mode", None) != mode:
+                    results[mode] = None
+                    print(f"{mode:>10}: not applied to this model")
+                    continue
+                results[mode] = self.real_time_factor(**kwargs)
+                print(f"{mode or 'eager':>10}: RTF {results[mode]:.3f}")
+        finally:
+            self.cpu_mode, self.warmup = original
+            self.load_model()
+        return results
 
     def speakers(self, **kwargs):
+        self._ensure_model()
         return self.model.speakers
     
     def audio(
@@ -80,25 +707,40 @@ class SileroTTS:
         language: str = None,
         speed: float = None,
     ):
-        model_modified = False
         if model_variant is not None and model_variant != self.model_variant:
             self.model_variant = model_variant
-            model_modified = True
+            self._model_stale = True
         if language is not None and language != self.language:
             self.language = language
-            model_modified = True
+            self._model_stale = True
         if speed is not None and speed != self.speed:
             print("Speed:", speed)
             self.speed = speed
-            text = self.prosody(text, speed)  # Fixed: update local text variable instead of self.text
-        if not self.model or model_modified:
-            self.load_model()
         if speaker is None:
             speaker = self.speaker
+        cache_key = None
+        if self.cache is not None:
+            cache_key = AudioCache.key(
+                text=text, speaker=speaker, sample_rate=sample_rate, model_variant=self.model_variant,
+                language=self.language, prosody=speed, model=f"{self.model_repo}/{self.model_name}",
+                cpu_mode=self.cpu_mode
+            )
+            audio = self.cache.get(cache_key)
+            if audio is not None:
+                self.metrics.record_cache_hit()
+                return audio
+        chars = len(text)  # Counted before prosody() adds SSML markup
+        if speed is not None:
+            text = self.prosody(text, speed)  # Fixed: update local text variable instead of self.text
+        self._ensure_model()
+        start = time.perf_counter()
         audio = self.model.apply_tts(
             text=text, speaker=speaker, sample_rate=sample_rate
         )
         audio = np.asarray(audio, dtype=np.float32)
+        self.metrics.record(time.perf_counter() - start, chars, len(audio) / sample_rate)
+        if cache_key is not None:
+            self.cache.put(cache_key, audio)
         return audio
 
     def prosody(self, text, speed: float = 1.0):
@@ -118,49 +760,255 @@ class SileroTTS:
         print("Text:", text)
         return text
 
-    def speak(self, letmefinish: bool = True, **kwargs):
+    def stream(self, text: str = "The quick brown fox jumps over the lazy dog.", **kwargs):
+        """
+        Synthesize text one sentence at a time.
+
+        Takes the same keyword arguments as audio().
+
+        Yields:
+            np.ndarray: float32 audio for each sentence, in order.
+        """
+        for sentence in split_sentences(text):
+            yield self.audio(text=sentence, **kwargs)
+
+    def speak(self, letmefinish: bool = True, streaming: bool = False, **kwargs):
+        """
+        Synthesize and play text.
+
+        Args:
+            letmefinish (bool): Block until playback ends.
+            streaming (bool): Start playing the first sentence while the
+                rest are still being synthesized.
+        """
         import sounddevice as sd
-        audio = self.audio(**kwargs)
         sample_rate = kwargs.get("sample_rate", 48000)
+        if streaming:
+            if letmefinish:
+                return self._play_stream(sample_rate, **kwargs)
+            player = threading.Thread(target=self._play_stream, args=(sample_rate,), kwargs=kwargs, daemon=True)
+            player.start()
+            return player
+        audio = self.audio(**kwargs)
         sd.play(audio, samplerate=sample_rate)
         if letmefinish:
             sd.wait()
 
-    def save(self, **kwargs):
+    def _play_stream(self, sample_rate: int, **kwargs):
+        """
+        Play stream() output through one OutputStream.
+
+        A worker thread synthesizes the next sentence while the current one
+        plays; the bounded queue keeps it at most STREAM_QUEUE_SIZE ahead.
+        """
+        import sounddevice as sd
+        chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        done = object()
+        stop = threading.Event()  # Set when playback ends, so the worker never waits forever
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def synthesize():
+            try:
+                for chunk in self.stream(**kwargs):
+                    if not put(chunk):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        threading.Thread(target=synthesize, daemon=True).start()
+        try:
+            with sd.OutputStream(samplerate=sample_rate, channels=1, dtype="float32") as out:
+                while True:
+                    chunk = chunks.get()
+                    if chunk is done:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    # Blocks while the device plays, which is when the worker synthesizes
+                    out.write(chunk.reshape(-1, 1))
+        finally:
+            stop.set()
+
+    def save(self, filename: str = "output.wav", target_rate: int = None, encoding: str = None, **kwargs):
+        """
+        Synthesize text straight into an audio file.
+
+        Args:
+            filename (str): Output path.
+            target_rate (int): Resample to this rate; defaults to the synthesis sample_rate.
+            encoding (str): One of ENCODINGS; defaults by file extension, else pcm16.
+
+        Returns:
+            float: Seconds of audio written.
+        """
+        return self.save_outputs([(filename, target_rate, encoding)], **kwargs)
+
+    def save_outputs(self, outputs, **kwargs):
+        """
+        Synthesize text once and write it to several files.
+
+        Sentences are synthesized one at a time and written as they arrive,
+        so long texts never sit in memory whole. Each output has its own
+        StreamResampler, e.g. to ship 16 kHz and 24 kHz copies of a 48 kHz
+        synthesis.
+
+        Args:
+            outputs: Iterable of (filename, target_rate, encoding); target_rate
+                and encoding may be None, see save().
+
+        Returns:
+            float: Seconds of audio written.
+        """
         import soundfile as sf
-        filename = kwargs.pop("filename", "output.wav")
-        audio = self.audio(**kwargs)
         sample_rate = kwargs.get("sample_rate", 48000)
-        # Assume filename is provided properly
-        sf.write(filename, audio, sample_rate)
+        writers = []
+        try:
+            for filename, target_rate, encoding in outputs:
+                encoding = encoding or EXTENSION_ENCODINGS.get(os.path.splitext(filename)[1].lower(), "pcm16")
+                if encoding not in ENCODINGS:
+                    raise ValueError(f"Unsupported encoding: {encoding}. Use one of {', '.join(ENCODINGS)}")
+                file_format, subtype = ENCODINGS[encoding]
+                target_rate = target_rate or sample_rate
+                writers.append((sf.SoundFile(filename, "w", samplerate=target_rate, channels=1,
+                                             format=file_format, subtype=subtype),
+                                StreamResampler(sample_rate, target_rate)))
+            samples = 0
+            for chunk in self.stream(**kwargs):
+                samples += len(chunk)
+                for writer, resampler in writers:
+                    writer.write(resampler.process(chunk))
+            for writer, resampler in writers:
+                writer.write(resampler.flush())
+        finally:
+            for writer, _ in writers:
+                writer.close()
+        return samples / sample_rate
+
+    def save_many(self, items, workers: int = None, threads_per_worker: int = None,
+                  chunk_size: int = BATCH_CHUNK_SIZE, **kwargs):
+        """
+        Synthesize many texts to files across a pool of worker processes.
+
+        Each worker loads its own copy of this instance's model once. Extra
+        keyword arguments (sample_rate, speed) are passed to audio().
+
+        Args:
+            items: Iterable of (text, speaker, filename) jobs; speaker may be None.
+            workers (int): Worker processes; defaults to half the CPU count.
+            threads_per_worker (int): torch threads per worker; defaults to
+                splitting the CPUs evenly between workers.
+            chunk_size (int): Jobs sent to a worker at a time.
+
+        Returns:
+            dict: files, audio_seconds, wall_seconds and throughput in
+            audio seconds per wall second.
+        """
+        jobs = [(text, speaker or self.speaker, filename) for text, speaker, filename in items]
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(workers or cpus // 2, len(jobs) or 1))
+        threads_per_worker = threads_per_worker or max(1, cpus // workers)
+        config = dict(model_variant=self.model_variant, language=self.language, speaker=self.speaker,
+                      model_repo=self.model_repo, model_name=self.model_name,
+                      cpu_mode=self.cpu_mode, warmup=self.warmup, bundle_dir=self.bundle.directory)
+
+        start = time.perf_counter()
+        audio_seconds = 0.0
+        # spawn: forked children inherit torch's thread pools and can deadlock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_batch_worker_init,
+                                 initargs=(config, threads_per_worker)) as pool:
+            chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+            for future in as_completed([pool.submit(_batch_worker_run, chunk, kwargs) for chunk in chunks]):
+                audio_seconds += future.result()
+        wall_seconds = time.perf_counter() - start
+
+        report = {
+            "files": len(jobs),
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall_seconds,
+            "throughput": audio_seconds / wall_seconds if wall_seconds else 0.0,
+        }
+        print(f"Saved {len(jobs)} files with {workers} workers x {threads_per_worker} threads: "
+              f"{audio_seconds:.1f} s of audio in {wall_seconds:.1f} s "
+              f"({report['throughput']:.2f} audio s / wall s)")
+        return report
+
+    def stats(self) -> dict:
+        """
+        Performance and memory metrics as a dict.
+
+        Combines TTSMetrics.stats() with process RSS (via psutil), model
+        parameter memory and, on GPU devices, allocator figures.
+        """
+        stats = self.metrics.stats()
+        stats["device"] = str(self.device)
+        stats["model_bytes"] = model_nbytes(self.model) if self.model is not None else 0
+        try:
+            import psutil
+            stats["process_rss_bytes"] = psutil.Process().memory_info().rss
+        except ImportError:
+            stats["process_rss_bytes"] = None
+        if self.device.type == "cuda":
+            stats["device_allocated_bytes"] = torch.cuda.memory_allocated(self.device)
+            stats["device_max_allocated_bytes"] = torch.cuda.max_memory_allocated(self.device)
+        elif self.device.type == "mps":
+            stats["device_allocated_bytes"] = torch.mps.driver_allocated_memory()
+            stats["device_max_bytes"] = torch.mps.recommended_max_memory()
+        if self.cache is not None:
+            stats["cache"] = {"hits": self.cache.hits, "misses": self.cache.misses}
+        return stats
 
     def interrogate(self):
-        def format_size(num_bytes):
-            for unit in ["B", "KB", "MB", "GB", "TB"]:
-                if num_bytes < 1024.0:
-                    return f"{num_bytes:.2f} {unit}"
-                num_bytes /= 1024.0
-        # TODO (Optional): Expand interrogations
-        device = self.device
-        if device == torch.device("cuda"):
-            #TODO (Optional): Test on a cuda device and show memory summary
-            #https://pytorch.org/docs/stable/cuda.html
-            #torch.cuda.memory_summary(device=device, abbreviated=True)
-            pass
-        elif device == torch.device("cpu"):
-            print("Using CPU, memory footprint not available.")
-        elif device == torch.device("mps"):
-            print("MPS Interrogation:")
-            print("Max memory: " + format_size(torch.mps.recommended_max_memory()))
-            #TODO (Optional): This seems to grossly under-report the memory usage
-            print("Allocated memory: " + format_size(torch.mps.driver_allocated_memory()))
-        else:
-            print("Unknown device: ", device)
+        """Print a readable metrics report and return the stats() dict."""
+        stats = self.stats()
+        latency = stats["latency_ms"]
+        print(f"Device: {stats['device']}")
+        print(f"Calls: {stats['calls']} synthesized, {stats['cache_hits']} from cache")
+        if latency["p50"] is not None:
+            print(f"Latency: p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+                  f"p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms")
+            print(f"Real-time factor: {stats['real_time_factor']:.3f}, "
+                  f"{stats['chars_per_second']:.0f} chars/s")
+        print("Latency histogram: " + ", ".join(
+            f"<={edge} ms: {count}" for edge, count in stats["latency_histogram_ms"].items() if count))
+        print("Model parameters: " + format_size(stats["model_bytes"]))
+        if stats["process_rss_bytes"] is not None:
+            print("Process RSS: " + format_size(stats["process_rss_bytes"]))
+        if "device_allocated_bytes" in stats:
+            #TODO (Optional): On MPS this seems to grossly under-report the memory usage
+            print("Device allocated memory: " + format_size(stats["device_allocated_bytes"]))
+        return stats
+
+    def start_metrics_log(self, path: str, interval: float = 60.0):
+        """
+        Append stats() as one JSON line to path every interval seconds,
+        from a background thread, until stop_metrics_log() is called.
+        """
+        self.stop_metrics_log()
+        stop = self._metrics_stop = threading.Event()
+
+        def log():
+            while not stop.wait(interval):
+                record = dict(self.stats(), time=time.time())
+                with open(path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+
+        threading.Thread(target=log, daemon=True).start()
 
-tts=SileroTTS()
-# Load a different model
-tts.load_model(model_repo="different_repo/models", model_name="custom_tts")
-print(tts.speakers())
+    def stop_metrics_log(self):
+        if self._metrics_stop is not None:
+            self._metrics_stop.set()
+            self._metrics_stop = None
 
 # TODO (Optional): Add a function to adjust the volume of the audio
 # TODO (Optional): Add a function to adjust the speaking rate
@@ -0,0 +1,212 @@
+"""
+Offline Silero model bundles.
+
+A bundle is a directory of pinned model files plus a ``manifest.json``
+recording each file's SHA-256 and how to load it:
+
+    {
+      "tts_v3_en": {"file": "v3_en.pt", "sha256": "..."},
+      "stt_en": {"file": "en_v5.jit", "sha256": "...", "labels": ["_", "a", ...]}
+    }
+
+Loading reads the file once, checks the hash on the bytes in memory and
+hands those bytes to torch, so a cold start is the import plus one file
+read; there is no hub repo resolution and no network access.
+
+Add files with:
+
+    python model_bundle.py add tts_v3_en path/to/v3_en.pt
+    python model_bundle.py add stt_en path/to/en_v5.jit --labels path/to/labels.json
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import torch
+
+MANIFEST = "manifest.json"
+DEFAULT_BUNDLE_DIR = os.environ.get(
+    "SILERO_BUNDLE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "silero_bundles")
+)
+STT_SAMPLE_RATE = 16000
+
+
+class BundleError(RuntimeError):
+    """A bundled model is missing or doesn't match its pinned checksum."""
+
+
+def tts_bundle_name(model_variant: str) -> str:
+    return f"tts_{model_variant}"
+
+
+def stt_bundle_name(language: str) -> str:
+    return f"stt_{language}"
+
+
+class ModelBundle:
+    """
+    A directory of checksummed model files.
+
+    Args:
+        directory (str): The bundle directory; defaults to $SILERO_BUNDLE_DIR
+            or ~/.cache/silero_bundles.
+    """
+
+    def __init__(self, directory: str = DEFAULT_BUNDLE_DIR):
+        self.directory = directory
+        path = os.path.join(directory, MANIFEST)
+        self.manifest = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.manifest = json.load(f)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.manifest
+
+    def read(self, name: str) -> bytes:
+        """Read a bundled file and verify it against the manifest."""
+        if name not in self.manifest:
+            raise BundleError(f"{name} is not in the bundle at {self.directory}")
+        entry = self.manifest[name]
+        path = os.path.join(self.directory, entry["file"])
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            raise BundleError(f"Cannot read bundled model {path}: {e}") from e
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != entry["sha256"]:
+            raise BundleError(f"Checksum mismatch for {path}: expected {entry['sha256']}, got {digest}")
+        return data
+
+    def load_tts(self, name: str, device):
+        """
+        Load a Silero TTS torch.package model.
+
+        Returns:
+            tuple: (model, None), shaped like torch.hub's silero_tts result.
+        """
+        entry = self.manifest.get(name, {})
+        importer = torch.package.PackageImporter(io.BytesIO(self.read(name)))
+        model = importer.load_pickle(entry.get("package", "tts_models"), entry.get("resource", "model"))
+        model.to(device)
+        return model, None
+
+    def load_stt(self, name: str, device):
+        """
+        Load a Silero STT TorchScript model.
+
+        Returns:
+            tuple: (model, decoder, utils), shaped like torch.hub's silero_stt
+            result, with utils as (read_batch, None, read_audio, prepare_model_input).
+        """
+        entry = self.manifest.get(name, {})
+        if "labels" not in entry:
+            raise BundleError(f"{name} has no labels in the manifest")
+        model = torch.jit.load(io.BytesIO(self.read(name)), map_location=device)
+        model.eval()
+        return model, CTCDecoder(entry["labels"]), (read_batch, None, read_audio, prepare_model_input)
+
+    def add(self, name: str, source: str, **extra):
+        """Copy a model file into the bundle and pin its checksum."""
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = os.path.basename(source)
+        target = os.path.join(self.directory, file_name)
+        if os.path.abspath(source) != os.path.abspath(target):
+            shutil.copyfile(source, target)
+        with open(target, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.manifest[name] = dict(extra, file=file_name, sha256=digest)
+        tmp_path = os.path.join(self.directory, MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+
+class CTCDecoder:
+    """
+    Greedy CTC decoder for Silero STT output.
+
+    Takes the most likely label per frame, collapses repeats and drops the
+    blank label "_". Silero spells doubled letters with a "2" label, which
+    repeats the previous character.
+    """
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.blank = labels.index("_") if "_" in labels else 0
+
+    def __call__(self, probs: torch.Tensor) -> str:
+        if probs.dim() == 3:
+            probs = probs[0]
+        chars = []
+        previous = None
+        for index in probs.argmax(dim=-1).tolist():
+            if index != previous and index != self.blank:
+                label = self.labels[index]
+                chars.append(chars[-1] if label == "2" and chars else label)
+            previous = index
+        return "".join(chars).strip()
+
+
+def read_audio(path: str, sample_rate: int = STT_SAMPLE_RATE) -> torch.Tensor:
+    """Read an audio file as a mono float tensor at sample_rate."""
+    import soundfile as sf
+    audio, rate = sf.read(path, dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    if rate != sample_rate:
+        from math import gcd
+        from scipy.signal import resample_poly
+        divisor = gcd(rate, sample_rate)
+        audio = resample_poly(audio, sample_rate // divisor, rate // divisor).astype(np.float32)
+    return torch.from_numpy(np.ascontiguousarray(audio))
+
+
+def read_batch(paths):
+    return [read_audio(path) for path in paths]
+
+
+def prepare_model_input(batch, device=torch.device("cpu")) -> torch.Tensor:
+    """Zero-pad a batch of 1-D audio tensors into one (batch, samples) tensor."""
+    batch = list(batch)
+    inputs = torch.zeros(len(batch), max(len(audio) for audio in batch))
+    for i, audio in enumerate(batch):
+        inputs[i, :len(audio)] = audio
+    return inputs.to(device)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage offline Silero model bundles.")
+    parser.add_argument("--dir", default=DEFAULT_BUNDLE_DIR, help="Bundle directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Add a model file to the bundle")
+    add.add_argument("name", help="Bundle entry, e.g. tts_v3_en or stt_en")
+    add.add_argument("path", help="Model file (.pt for TTS, .jit for STT)")
+    add.add_argument("--labels", help="JSON file with the STT model's label list")
+    commands.add_parser("verify", help="Check every bundled file against its checksum")
+    args = parser.parse_args(argv)
+
+    bundle = ModelBundle(args.dir)
+    if args.command == "add":
+        extra = {}
+        if args.labels:
+            with open(args.labels) as f:
+                extra["labels"] = json.load(f)
+        bundle.add(args.name, args.path, **extra)
+        print(f"Added {args.name} to {args.dir}")
+    else:
+        for name in bundle.manifest:
+            try:
+                bundle.read(name)
+                print(f"{name}: ok")
+            except BundleError as e:
+                print(f"{name}: {e}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
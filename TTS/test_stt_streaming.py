@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from STT_Silero import StreamingTranscriber
+
+SAMPLE_RATE = 16000
+
+
+class FakeSTT:
+    sample_rate = SAMPLE_RATE
+
+
+class DurationTranscriber(StreamingTranscriber):
+    """Transcribes an utterance as its length, so no model is needed."""
+
+    def _transcribe(self):
+        return f"{sum(len(frame) for frame in self._utterance) / SAMPLE_RATE:.2f}"
+
+
+rng = np.random.default_rng(0)
+
+
+def noise(seconds, rms):
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * rms).astype(np.float32)
+
+
+def tone(seconds, amplitude=0.2, syllables=False):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = amplitude * np.sin(2 * np.pi * 220 * t)
+    if syllables:
+        audio *= np.sin(2 * np.pi * 3 * t) > -0.3
+    return audio.astype(np.float32)
+
+
+def finals(audio):
+    transcriber = DurationTranscriber(FakeSTT())
+    events = []
+    for start in range(0, len(audio), 1600):
+        events += transcriber.feed(audio[start:start + 1600])
+    events += transcriber.flush()
+    return [event for event in events if event.final]
+
+
+def test_long_speech_is_one_utterance():
+    speech = tone(8, syllables=True) + noise(8, 0.01)
+    events = finals(np.concatenate((noise(1, 0.01), speech, noise(1.5, 0.01))))
+    assert len(events) == 1
+    assert events[0].start <= 1.0 and events[0].end >= 9.0
+
+
+def test_steady_tone_is_not_cut_off():
+    events = finals(np.concatenate((noise(1, 0.01), tone(5), noise(1.5, 0.01))))
+    assert len(events) == 1
+    assert float(events[0].text) >= 5.0
+
+
+def test_loud_noise_is_not_speech():
+    assert finals(noise(60, 0.02)) == []
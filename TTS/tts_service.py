@@ -0,0 +1,447 @@
+"""
+One warm SileroTTS shared by many processes over a local socket.
+
+Run the service on a Unix socket (the default) or a TCP port:
+
+    python tts_service.py
+    python tts_service.py --port 8765 --cpu-mode quantize
+
+and replace direct tts.speak() calls with the client:
+
+    from tts_service import TTSClient
+    tts = TTSClient()
+    tts.speak(text="Hello there")
+
+Wire format, in both directions, is a sequence of frames, each a 4-byte
+big-endian length followed by that many bytes. A request is one JSON frame
+({"text", "speaker", "sample_rate", "speed"}). The response is a JSON
+header frame ({"sample_rate"} or {"error"}), then frames starting with a
+kind byte: AUDIO_FRAME followed by 16-bit little-endian PCM, or
+ERROR_FRAME followed by a UTF-8 message when synthesis fails part way.
+An empty frame ends the response.
+
+At most queue_size requests are accepted and unfinished at once, whether
+waiting or part way through; beyond that new requests are turned away at
+once rather than waiting behind an ever-growing backlog. Short
+requests that arrive together and share a voice are synthesized as one
+batch, with repeated texts made once and each request answered as soon
+as its own text is done, and long requests are synthesized a sentence at a time, taking
+turns with the short ones so they can't hold up the queue.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "silero_tts.sock")
+# Requests accepted and not yet finished; more than this are refused with "busy"
+MAX_QUEUED_REQUESTS = 64
+# How long the first short request waits for others to batch with
+BATCH_WINDOW_SECONDS = 0.005
+MAX_BATCH_SIZE = 8
+# Requests up to this many characters are batched; longer ones are streamed by sentence
+SHORT_REQUEST_CHARS = 200
+# PCM samples per response frame
+CHUNK_SAMPLES = 4800
+# Refuse request frames larger than this
+MAX_REQUEST_BYTES = 1024 ** 2
+
+FRAME_HEADER = struct.Struct(">I")
+# First byte of each response frame after the header
+AUDIO_FRAME = b"a"
+ERROR_FRAME = b"e"
+
+
+def to_pcm16(audio: np.ndarray) -> bytes:
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def from_pcm16(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32767
+
+
+class Request:
+    """
+    One client's synthesis request and the channel its audio goes back on.
+    """
+
+    __slots__ = ("text", "speaker", "sample_rate", "speed", "out", "cancelled")
+
+    def __init__(self, text, speaker=None, sample_rate=48000, speed=None):
+        self.text = text
+        self.speaker = speaker
+        self.sample_rate = sample_rate
+        self.speed = speed
+        self.out = asyncio.Queue()   # PCM bytes, then None; or an Exception
+        self.cancelled = False       # The client went away
+
+    def voice(self):
+        """Requests with the same voice can be synthesized in one batch."""
+        return (self.speaker, self.sample_rate, self.speed)
+
+    def send(self, audio: np.ndarray):
+        pcm = to_pcm16(audio)
+        step = CHUNK_SAMPLES * 2
+        for start in range(0, len(pcm), step):
+            self.out.put_nowait(pcm[start:start + step])
+
+
+class TTSService:
+    """
+    Serve SileroTTS.audio() to many clients from one model.
+
+    Synthesis runs on a single worker thread, since the model isn't safe
+    to call concurrently; the event loop only moves requests and audio.
+
+    Args:
+        tts (SileroTTS): The model to serve; it's preloaded on start().
+        queue_size (int): Most requests accepted and unfinished at once.
+        batch_window (float): Seconds a short request waits for company.
+        max_batch (int): Most requests synthesized in one batch.
+        short_chars (int): Longest request that is batched rather than streamed.
+    """
+
+    def __init__(self, tts, queue_size=MAX_QUEUED_REQUESTS, batch_window=BATCH_WINDOW_SECONDS,
+                 max_batch=MAX_BATCH_SIZE, short_chars=SHORT_REQUEST_CHARS):
+        self.tts = tts
+        self.queue_size = queue_size
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.short_chars = short_chars
+        self.queue = None
+        self.active = 0   # Accepted requests whose response hasn't finished
+        self.served = 0
+        self.refused = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+        self._worker = None
+
+    def is_short(self, request):
+        return len(request.text) <= self.short_chars
+
+    async def start(self, path=None, host=None, port=None):
+        """
+        Load the model and start listening.
+
+        Listens on TCP host:port when port is given, else on the Unix
+        socket at path (DEFAULT_SOCKET_PATH by default).
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.tts.preload, False)
+        self.queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._work())
+        if port is not None:
+            server = await asyncio.start_server(self._handle, host or "127.0.0.1", port)
+        else:
+            path = path or DEFAULT_SOCKET_PATH
+            if os.path.exists(path):
+                os.remove(path)
+            server = await asyncio.start_unix_server(self._handle, path)
+        where = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"TTS service listening on {where}")
+        return server
+
+    @staticmethod
+    def parse_request(fields) -> Request:
+        """Build a Request from a decoded request frame, raising ValueError if it's malformed."""
+        if not isinstance(fields, dict):
+            raise ValueError("expected a JSON object")
+        text, speaker = fields.get("text"), fields.get("speaker")
+        sample_rate, speed = fields.get("sample_rate", 48000), fields.get("speed")
+        if not isinstance(text, str) or not text:
+            raise ValueError("text must be a non-empty string")
+        if speaker is not None and not isinstance(speaker, str):
+            raise ValueError("speaker must be a string")
+        if not isinstance(sample_rate, int) or isinstance(sample_rate, bool) or sample_rate <= 0:
+            raise ValueError("sample_rate must be a positive integer")
+        if speed is not None and (not isinstance(speed, (int, float)) or isinstance(speed, bool)):
+            raise ValueError("speed must be a number")
+        return Request(text, speaker, sample_rate, speed)
+
+    async def _handle(self, reader, writer):
+        request = None
+        try:
+            try:
+                (size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                if size > MAX_REQUEST_BYTES:
+                    raise ValueError(f"Request of {size} bytes is too large")
+                request = self.parse_request(json.loads(await reader.readexactly(size)))
+            except ValueError as e:
+                await self._write_frame(writer, json.dumps({"error": f"Bad request: {e}"}).encode())
+                return
+            if self.active >= self.queue_size:
+                request = None
+                self.refused += 1
+                await self._write_frame(writer, json.dumps({"error": "busy"}).encode())
+                return
+            self.active += 1
+            self.queue.put_nowait(request)
+            await self._write_frame(writer, json.dumps({"sample_rate": request.sample_rate}).encode())
+            while True:
+                item = await request.out.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    print(f"Synthesis failed: {item}")
+                    await self._write_frame(writer, ERROR_FRAME + str(item).encode())
+                    break
+                await self._write_frame(writer, AUDIO_FRAME + item)
+            await self._write_frame(writer, b"")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if request is not None:
+                request.cancelled = True
+                self.active -= 1
+            writer.close()
+
+    @staticmethod
+    async def _write_frame(writer, payload: bytes):
+        writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+        await writer.drain()
+
+    async def _work(self):
+        """
+        Drain the queue: batch the short requests, and advance each long
+        request one sentence per turn so short ones never wait behind a
+        whole long text.
+        """
+        streams = deque()   # (request, sentence iterator) of long requests in progress
+        while True:
+            pending = []
+            try:
+                if not streams:
+                    first = await self.queue.get()
+                    pending.append(first)
+                    if self.is_short(first):
+                        await asyncio.sleep(self.batch_window)
+                while not self.queue.empty():
+                    pending.append(self.queue.get_nowait())
+
+                batches = {}
+                for request in pending:
+                    if self.is_short(request):
+                        batches.setdefault(request.voice(), []).append(request)
+                    else:
+                        streams.append((request, None))
+                pending = [request for batch in batches.values() for request in batch]
+                for batch in batches.values():
+                    for start in range(0, len(batch), self.max_batch):
+                        await self._run_batch(batch[start:start + self.max_batch])
+                pending = []
+
+                if streams:
+                    request, sentences = streams.popleft()
+                    if not request.cancelled:
+                        pending = [request]
+                        await self._advance(request, sentences, streams)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Fail the requests in hand; the worker must outlive any one of them
+                print(f"TTS worker error: {e}")
+                for request in pending:
+                    request.out.put_nowait(e)
+
+    async def _run_batch(self, batch):
+        """
+        Synthesize a batch of same-voice requests. Silero's apply_tts takes
+        a single text, so the texts run one after another, each text asked
+        for more than once is made once, and every request gets its audio
+        as soon as its own text is done rather than when the batch is.
+        """
+        batch = [request for request in batch if not request.cancelled]
+        if not batch:
+            return
+        loop = asyncio.get_running_loop()
+        by_text = {}
+        for request in batch:
+            by_text.setdefault(request.text, []).append(request)
+        for text, requests in by_text.items():
+            requests = [request for request in requests if not request.cancelled]
+            if not requests:
+                continue
+            voice = requests[0]
+            try:
+                audio = await loop.run_in_executor(
+                    self._executor, functools.partial(self.tts.audio, text=text, speaker=voice.speaker,
+                                                      sample_rate=voice.sample_rate, speed=voice.speed))
+            except Exception as e:
+                for request in requests:
+                    request.out.put_nowait(e)
+                continue
+            for request in requests:
+                request.send(audio)
+                request.out.put_nowait(None)
+            self.served += len(requests)
+        self.batches += 1
+        self.batched_requests += len(batch)
+
+    async def _advance(self, request, sentences, streams):
+        """
+        Synthesize and send the next sentence of a long request, putting it
+        back at the end of streams until its last sentence is sent.
+        """
+        loop = asyncio.get_running_loop()
+        if sentences is None:
+            sentences = self.tts.stream(text=request.text, speaker=request.speaker,
+                                        sample_rate=request.sample_rate, speed=request.speed)
+        try:
+            audio = await loop.run_in_executor(self._executor, next, sentences, None)
+        except Exception as e:
+            request.out.put_nowait(e)
+            return
+        if audio is None:
+            request.out.put_nowait(None)
+            self.served += 1
+            return
+        request.send(audio)
+        streams.append((request, sentences))
+
+    def stats(self) -> dict:
+        """Service counters plus the model's SileroTTS.stats()."""
+        return dict(
+            self.tts.stats(),
+            active=self.active,
+            served=self.served,
+            refused=self.refused,
+            batches=self.batches,
+            mean_batch_size=self.batched_requests / self.batches if self.batches else 0.0,
+        )
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        self._executor.shutdown(wait=False)
+
+
+class TTSClient:
+    """
+    Talks to a running TTSService; a drop-in for SileroTTS.audio() and speak().
+
+    Args:
+        path (str): Unix socket of the service.
+        host (str), port (int): TCP address of the service, used when port is given.
+        timeout (float): Socket timeout in seconds.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, host: str = "127.0.0.1", port: int = None,
+                 timeout: float = 60.0):
+        self.path = path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _connect(self):
+        if self.port is not None:
+            return socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        return sock
+
+    @staticmethod
+    def _read_frame(stream) -> bytes:
+        header = stream.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            raise ConnectionError("TTS service closed the connection")
+        (size,) = FRAME_HEADER.unpack(header)
+        payload = stream.read(size)
+        if len(payload) < size:
+            raise ConnectionError("TTS service closed the connection")
+        return payload
+
+    def stream(self, text: str, speaker: str = None, sample_rate: int = 48000, speed: float = None):
+        """
+        Request text and yield its audio as it arrives.
+
+        Yields:
+            np.ndarray: float32 audio chunks, in order.
+        """
+        request = json.dumps({"text": text, "speaker": speaker, "sample_rate": sample_rate, "speed": speed})
+        with self._connect() as sock, sock.makefile("rb") as stream:
+            sock.sendall(FRAME_HEADER.pack(len(request)) + request.encode())
+            header = json.loads(self._read_frame(stream))
+            if "error" in header:
+                raise RuntimeError(f"TTS service: {header['error']}")
+            while True:
+                payload = self._read_frame(stream)
+                if not payload:
+                    break
+                if payload[:1] == ERROR_FRAME:
+                    raise RuntimeError(f"TTS service: {payload[1:].decode(errors='replace')}")
+                yield from_pcm16(payload[1:])
+
+    def audio(self, text: str = "The quick brown fox jumps over the lazy dog.", **kwargs) -> np.ndarray:
+        chunks = list(self.stream(text, **kwargs))
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    def speak(self, letmefinish: bool = True, text: str = "The quick brown fox jumps over the lazy dog.",
+              **kwargs):
+        """
+        Play text through the default output device as its audio arrives.
+
+        Args:
+            letmefinish (bool): Block until playback ends; otherwise play on
+                a daemon thread and return it.
+        """
+        if not letmefinish:
+            player = threading.Thread(target=self.speak, kwargs=dict(kwargs, text=text), daemon=True)
+            player.start()
+            return player
+        import sounddevice as sd
+        sample_rate = kwargs.get("sample_rate", 48000)
+        with sd.OutputStream(samplerate=sample_rate, channels=1, dtype="float32") as out:
+            for chunk in self.stream(text, **kwargs):
+                out.write(chunk.reshape(-1, 1))
+
+
+async def serve(service, path=None, host=None, port=None):
+    server = await service.start(path=path, host=host, port=port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    from TTS_Silero import CPU_MODES, SileroTTS
+
+    parser = argparse.ArgumentParser(description="Serve SileroTTS over a local socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host, with --port")
+    parser.add_argument("--port", type=int, default=None, help="Listen on TCP instead of a Unix socket")
+    parser.add_argument("--variant", default="v3_en", help="Silero model variant")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--speaker", default="en_1")
+    parser.add_argument("--cpu-mode", default=None, choices=[mode for mode in CPU_MODES if mode])
+    parser.add_argument("--queue-size", type=int, default=MAX_QUEUED_REQUESTS)
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW_SECONDS)
+    args = parser.parse_args(argv)
+
+    tts = SileroTTS(model_variant=args.variant, language=args.language, speaker=args.speaker,
+                    cpu_mode=args.cpu_mode, warmup=True)
+    service = TTSService(tts, queue_size=args.queue_size, batch_window=args.batch_window)
+    try:
+        asyncio.run(serve(service, path=args.socket, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
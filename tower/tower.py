@@ -1,277 +1,60 @@
 import pygame
 import sys
-
-## Constants 
-# Screen dimensions
-WIDTH = 800
-HEIGHT = 600
-FPS = 60
-
-# UI Margins
-UI_LEFT_MARGIN = 150
-UI_RIGHT_MARGIN = 150
-
-# Colors
-SKY_COLOR = (180, 220, 255)
-EARTH_COLOR = (170, 140, 110)
-ROOM_COLOR = (230, 190, 255)
-GROUND_COLOR = (100, 80, 50)
-BUTTON_COLOR = (200, 240, 200)
-TEXT_COLOR = (0, 0, 0)
-
-# World
-WORLD_HORIZON_Y = 0
-
-# Room dimensions
-ROOM_WIDTH = 120
-ROOM_HEIGHT = 40
-ROOM_SPACING = 1
-
-# Font
-pygame.init()
-FONT = pygame.font.SysFont(None, 24)
-##
-
-class Button:
-    def __init__(self, x, y, w, h, text):
-        self.rect = pygame.Rect(x, y, w, h)
-        self.text = text
-
-    def draw(self, surface):
-        pygame.draw.rect(surface, BUTTON_COLOR, self.rect)
-        label = FONT.render(self.text, True, TEXT_COLOR)
-        surface.blit(label, (self.rect.x + 5, self.rect.y + 10))
-
-    def is_clicked(self, pos):
-        return self.rect.collidepoint(pos)
-
-# Initialize Pygame
-pygame.init()
-
-# Screen setup
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Wizard Tower Builder")
-clock = pygame.time.Clock()
-
-class Camera:
-    def __init__(self):
-        """Initialize camera with default values."""
-        self.reset()
-
-    def reset(self):
-        """Reset the camera to its default position and zoom."""
-        self.offset_y = HEIGHT // 2
-        self.zoom = 1.0
-
-    def get(self):
-        """Get the current camera state as a tuple (offset_y, zoom)."""
-        return self.offset_y, self.zoom
-
-    def set(self, offset, zoom):
-        """Set the camera position and zoom level."""
-        self.offset_y = offset
-        self.zoom = zoom
-
-    def calculate_min_zoom_only(self, tower_rooms, basement_rooms):
-        """
-        Calculate the minimum zoom level to fit the entire tower and basement.
-
-        Returns:
-            float: The minimum zoom level (clamped to max 1.0).
-        """
-        if not tower_rooms and not basement_rooms:
-            return 1.0
-
-        top = tower_rooms[-1].rect.y if tower_rooms else WORLD_HORIZON_Y
-        bottom = basement_rooms[-1].rect.y if basement_rooms else WORLD_HORIZON_Y
-
-        total_height = (bottom - top + ROOM_HEIGHT + ROOM_SPACING)
-        return min(1.0, (HEIGHT - 100) / total_height)
-
-    def calculate_min_zoom_and_scroll(self, tower_rooms, basement_rooms):
-        """
-        Auto-adjust zoom and scroll to fit the current tower and basement in view.
-        """
-        if not tower_rooms and not basement_rooms:
-            self.zoom = 1.0
-            self.offset_y = HEIGHT // 2
-            return
-
-        top = tower_rooms[-1].rect.y if tower_rooms else WORLD_HORIZON_Y
-        bottom = basement_rooms[-1].rect.y if basement_rooms else WORLD_HORIZON_Y
-
-        total_height = (bottom - top + ROOM_HEIGHT + ROOM_SPACING)
-        self.zoom = min(1.0, (HEIGHT - 100) / total_height)
-
-        mid_world_y = (top + bottom) / 2
-        screen_mid_y = HEIGHT / (2 * self.zoom)
-        self.offset_y = screen_mid_y - mid_world_y
-
-    def calculate_max_zoom(self):
-        """
-        Set the maximum zoom level based on usable UI width.
-        """
-        usable_width = WIDTH - UI_LEFT_MARGIN - UI_RIGHT_MARGIN
-        self.zoom = min(2.0, usable_width / ROOM_WIDTH)
-
-    def apply_zoom(self, amount, tower_rooms, basement_rooms):
-        """
-        Apply a zoom increment while respecting min/max zoom bounds.
-
-        Args:
-            amount (float): The zoom increment.
-        """
-        usable_width = WIDTH - UI_LEFT_MARGIN - UI_RIGHT_MARGIN
-        max_zoom = min(2.0, usable_width / ROOM_WIDTH)
-        min_zoom = self.calculate_min_zoom_only(tower_rooms, basement_rooms)
-        self.zoom = max(min_zoom, min(max_zoom, self.zoom + amount))
-
-    def handle_mouse_scroll(self, event, tower):
-        scroll_amount = (0.5 / self.zoom) * -event.y
-        self.offset_y += scroll_amount
-
-        # World Y positions
-        top_y = tower.get_peak()        # e.g. -120
-        bottom_y = tower.get_bottom()   # e.g. 80
-        visible_height = HEIGHT / self.zoom
-
-        # Compute screen edges in world space
-        screen_top_world_y = -self.offset_y
-        screen_bottom_world_y = screen_top_world_y + visible_height
-
-        # Clamp: don’t let screen show above top of tower
-        if screen_top_world_y < top_y:
-            self.offset_y = -top_y
-        # Clamp: don’t let screen show below bottom of tower
-        elif screen_bottom_world_y > bottom_y:
-            self.offset_y = -(bottom_y - visible_height)
-
+import tempfile
+import time
+
+from tower_cam import WorldCamera
+from tower_config import (
+    WIDTH, HEIGHT, FPS,
+    SKY_COLOR, EARTH_COLOR, GROUND_COLOR,
+    WORLD_HORIZON_Y,
+    BULK_BUILD_COUNT,
+    ZOOM_STEP, LOD_ZOOM, SCROLL_X_STEP,
+    get_font
+)
+from tower_dirty import DirtyRegions
+from tower_model import build_room, dig_basement
+from tower_profiler import FrameProfiler
+from tower_snapshot import WorldSnapshot
+from tower_sprites import SPRITES
+from tower_ui import Button, draw_resources
+from tower_world import World
+
+def init_display():
+    """
+    Initialize pygame and open the game window. Kept out of import time so
+    the engine can run headless (e.g. under SDL's dummy video driver).
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Wizard Tower Builder")
+    return screen
 
 # Initialize camera
-camera = Camera()
+camera = WorldCamera(smooth=True)
 camera.reset()
 
-class Room:
-    def __init__(self, x=0, y=0, width=120, height=40, room_type="Empty room", cost=0, color=(200, 200, 200)):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.type = room_type
-        self.cost = cost
-        self.color = color
-
-    @property
-    def x(self):
-        return self.rect.x
-
-    @x.setter
-    def x(self, value):
-        self.rect.x = value
-
-    @property
-    def y(self):
-        return self.rect.y
-
-    @y.setter
-    def y(self, value):
-        self.rect.y = value
-
-    @property
-    def width(self):
-        return self.rect.width
-
-    @property
-    def height(self):
-        return self.rect.height
-
-    def draw(self, surface, camera):
-        """
-        Draw the room with current camera zoom and offset applied.
-        """
-        offset_y, zoom = camera.get()
-
-        scaled_rect = self.rect.copy()
-        scaled_rect.x = int(self.rect.x * zoom)
-        scaled_rect.y = int((self.rect.y - WORLD_HORIZON_Y + offset_y) * zoom)
-        scaled_rect.width = int(self.rect.width * zoom)
-        scaled_rect.height = int(self.rect.height * zoom)
-
-        pygame.draw.rect(surface, self.color, scaled_rect)
-
-        if FONT and self.type:
-            text = FONT.render(self.type, True, (0, 0, 0))
-            text_rect = text.get_rect(center=scaled_rect.center)
-            surface.blit(text, text_rect)
-
-class Resources:
-    def __init__(self):
-        self.mana = 0
-        self.earth = 0
-        self.wood = 0
-        self.stone = 0
-        self.gold = 0
-
-    def add(self, resource, amount):
-        if hasattr(self, resource):
-            setattr(self, resource, getattr(self, resource) + amount)
-
-    def spend(self, resource, amount):
-        if hasattr(self, resource) and getattr(self, resource) >= amount:
-            setattr(self, resource, getattr(self, resource) - amount)
-            return True
-        return False
-
-    def to_dict(self):
-        return {
-            "mana": self.mana,
-            "earth": self.earth,
-            "wood": self.wood,
-            "stone": self.stone,
-            "gold": self.gold
-        }
-        
-    def draw(self, surface, x=20, y=20):
-        for resource, amount in self.to_dict().items():
-            label = FONT.render(f"{resource}: {amount}", True, TEXT_COLOR)
-            surface.blit(label, (x, y))
-            y += 30
-
-
-class Tower:
-    def __init__(self):
-        self.rooms = []        # Rooms above the horizon
-        self.basements = []    # Rooms below the horizon
-        self.resources = Resources()
-
-    def add_room(self, room):
-        self.rooms.append(room)
-
-    def add_basement(self, room):
-        self.basements.append(room)
-
-    @property
-    def height(self):
-        return sum(room.height for room in self.rooms)
-
-    @property
-    def depth(self):
-        return -sum(room.height for room in self.basements)
-
-    def get_peak(self):
-        return self.rooms[-1].y if self.rooms else WORLD_HORIZON_Y
-
-    def get_bottom(self):
-        last = self.basements[-1] if self.basements else None
-        return last.y + last.height if last else WORLD_HORIZON_Y
-
-
 # UI Buttons
 build_button    = Button(WIDTH - 150, 100, 120, 40, "Build Room")
 dig_button      = Button(WIDTH - 150, 160, 120, 40, "Dig Basement")
 
-def draw_base(surface, camera):
+# Screen area covered by the resource counters drawn by draw_resources
+RESOURCES_PANEL = pygame.Rect(0, 0, WIDTH // 2, 20 + 30 * 5)
+
+# Frame profiler: F3 toggles the overlay, F4 writes the stats to PROFILE_CSV
+PROFILER = FrameProfiler()
+PROFILE_CSV = "tower_profile.csv"
+PROFILE_LINE_HEIGHT = 20
+PROFILE_OVERLAY = pygame.Rect(0, HEIGHT - 40 - PROFILE_LINE_HEIGHT * (len(PROFILER.phases) + 2), WIDTH // 2, PROFILE_LINE_HEIGHT * (len(PROFILER.phases) + 2))
+
+# Last rendered world layer, reused for frames while a smooth camera eases
+SNAPSHOT = WorldSnapshot()
+
+def draw_base(surface, tower, camera):
     offset_y, zoom = camera.get()
     scaled_w = int(200 * zoom)
     scaled_h = int(50 * zoom)
-    x = (WIDTH // 2) - (scaled_w // 2)
+    x = int((tower.center_x + camera.offset_x) * zoom) - (scaled_w // 2)
     screen_y = int((WORLD_HORIZON_Y + offset_y) * zoom)
     pygame.draw.rect(surface, GROUND_COLOR, (x, screen_y, scaled_w, scaled_h))
 
@@ -286,61 +69,258 @@ def draw_background(surface, camera):
     pygame.draw.rect(surface, SKY_COLOR, (0, 0, WIDTH, horizon_y))
     pygame.draw.rect(surface, EARTH_COLOR, (0, horizon_y, WIDTH, HEIGHT - horizon_y))
 
+def draw_rooms(surface, store, rows, camera):
+    """
+    Draw a range of rooms from a RoomStore with a single Surface.blits call.
+
+    Reads the store's columns directly instead of building Room views, and
+    uses pre-composed sprites so each room is one blit.
+    """
+    offset_y, zoom = camera.get()
+    offset_x = camera.offset_x
+    xs, ys, widths, heights = store.x, store.y, store.width, store.height
+    type_ids, color_ids = store.type_id, store.color_id
+    types, colors = store.types, store.colors
+    font = get_font()
+    blits = []
+    for i in range(*rows.indices(len(store))):
+        width, height = int(widths[i] * zoom), int(heights[i] * zoom)
+        if not width or not height:
+            continue
+        sprite = SPRITES.get(font, types[type_ids[i]], colors[color_ids[i]], width, height, zoom)
+        blits.append((sprite, (int((xs[i] + offset_x) * zoom), int((ys[i] - WORLD_HORIZON_Y + offset_y) * zoom))))
+    surface.blits(blits, doreturn=False)
+
+def draw_room_runs(surface, store, rows, camera):
+    """
+    Low-detail room drawing for far zoom levels.
+
+    Each run of consecutive rooms with the same type and color is filled as
+    one rectangle spanning the run, and labels are skipped since they would
+    be unreadable at this size.
+    """
+    offset_y, zoom = camera.get()
+    xs, ys, widths, heights = store.x, store.y, store.width, store.height
+    colors = store.colors
+    for first, end, _, color_id in store.runs(rows):
+        last = end - 1
+        top = min(ys[first], ys[last])
+        bottom = max(ys[first] + heights[first], ys[last] + heights[last])
+        screen_top = int((top - WORLD_HORIZON_Y + offset_y) * zoom)
+        screen_bottom = int((bottom - WORLD_HORIZON_Y + offset_y) * zoom)
+        rect = (int((xs[first] + camera.offset_x) * zoom), screen_top, max(1, int(widths[first] * zoom)), max(1, screen_bottom - screen_top))
+        surface.fill(colors[color_id], rect)
+
 def draw_debug_info(surface, camera):
     offset_y, zoom = camera.get()
-    text = FONT.render(f"offset_y: {offset_y:.1f}, zoom: {zoom:.2f}", True, (255, 0, 0))
+    # Like the profiler lines, this changes whenever the camera moves, so it
+    # bypasses the label cache instead of flushing the room and button labels
+    text = get_font().render(f"offset_y: {offset_y:.1f}, zoom: {zoom:.2f}", True, (255, 0, 0))
     surface.blit(text, (10, HEIGHT - 30))
 
-def main():
-    running = True
-
-    # Initialize the tower
-    tower = Tower()
+    if PROFILER.enabled:
+        y = PROFILE_OVERLAY.y
+        for line in PROFILER.lines(FPS):
+            surface.blit(get_font().render(line, True, (255, 0, 0)), (10, y))
+            y += PROFILE_LINE_HEIGHT
+
+def draw_scene(surface, tower, camera, towers=None):
+    """
+    Draw the world and the UI on top of it.
+
+    Args:
+        tower (Tower): The active tower, whose resources the UI shows.
+        towers (list): Every tower on screen; defaults to just the active one.
+    """
+    start = time.perf_counter()
+    draw_background(surface, camera)
+    PROFILER.mark("background")
+    draw = draw_room_runs if camera.zoom < LOD_ZOOM else draw_rooms
+    for each in towers or (tower,):
+        visible_rooms, visible_basements = each.visible_slices(camera)
+        draw(surface, each.rooms, visible_rooms, camera)
+        PROFILER.mark("rooms")
+        draw_base(surface, each, camera)
+        PROFILER.mark("base")
+        draw(surface, each.basements, visible_basements, camera)
+        PROFILER.mark("rooms")
+    draw_horizon(surface, camera)
+    if camera.smooth:
+        SNAPSHOT.capture(surface, camera, time.perf_counter() - start)
+    PROFILER.mark("base")
+    draw_ui(surface, tower, camera)
+
+def draw_ui(surface, tower, camera):
+    draw_debug_info(surface, camera)
+    build_button.draw(surface)
+    dig_button.draw(surface)
+    draw_resources(surface, tower.resources.to_dict())
+    PROFILER.mark("ui")
+
+def mark_changes(dirty, tower, camera, towers=None):
+    """
+    Turn the change flags on the towers, camera and resources into dirty regions.
+    """
+    if camera.moved:
+        # Everything on screen shifts when the camera moves
+        dirty.mark_all()
+        camera.moved = False
 
-    while running:
-        clock.tick(FPS)
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if build_button.is_clicked(event.pos):
-                    if tower.rooms:
-                        new_y = tower.rooms[-1].y - (ROOM_HEIGHT + ROOM_SPACING)
-                    else:
-                        new_y = WORLD_HORIZON_Y - ROOM_HEIGHT - ROOM_SPACING
-                    tower.add_room(Room(x=WIDTH // 2 - ROOM_WIDTH // 2, y=new_y, width=ROOM_WIDTH, height=ROOM_HEIGHT, color=(200, 200, 200), room_type="Room"))
-
-                elif dig_button.is_clicked(event.pos):
-                    if tower.basements:
-                        new_y = tower.basements[-1].y + (ROOM_HEIGHT + ROOM_SPACING)
-                    else:
-                        new_y = WORLD_HORIZON_Y + ROOM_SPACING
-                    tower.add_basement(Room(x=WIDTH // 2 - ROOM_WIDTH // 2, y=new_y, width=ROOM_WIDTH, height=ROOM_HEIGHT, color=(100, 100, 100), room_type="Basement"))
-                    tower.resources.add("earth", 10)
-
-            elif event.type == pygame.MOUSEWHEEL:
-                camera.handle_mouse_scroll(event, tower)
-
-        # Draw scene
+    offset_y, zoom = camera.get()
+    for each in towers or (tower,):
+        if each.changed_area:
+            left, top, right, bottom = each.changed_area
+            screen_left = int((left + camera.offset_x) * zoom)
+            screen_top = int((top - WORLD_HORIZON_Y + offset_y) * zoom)
+            screen_bottom = int((bottom - WORLD_HORIZON_Y + offset_y) * zoom) + 1
+            dirty.mark(pygame.Rect(screen_left, screen_top, int((right - left) * zoom) + 1, screen_bottom - screen_top))
+            each.changed_area = None
+
+    if tower.resources.changed:
+        dirty.mark(RESOURCES_PANEL)
+        tower.resources.changed = False
+
+def handle_events(events, tower, camera, dirty):
+    """
+    Apply a batch of input events to the game state.
+
+    Wheel events are summed and applied as one camera scroll per batch.
+    Horizontal wheel motion and the arrow keys pan a WorldCamera sideways.
+
+    Returns:
+        bool: False once a QUIT event has been seen.
+    """
+    running = True
+    wheel_steps = 0
+    wheel_x = 0
+    panning = isinstance(camera, WorldCamera)
+    for event in events:
+        if event.type == pygame.QUIT:
+            running = False
+
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            dirty.mark_all()
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # Shift-click builds or digs a whole batch at once
+            count = BULK_BUILD_COUNT if pygame.key.get_mods() & pygame.KMOD_SHIFT else 1
+            if build_button.is_clicked(event.pos):
+                build_room(tower, count)
+            elif dig_button.is_clicked(event.pos):
+                dig_basement(tower, count)
+
+        elif event.type == pygame.MOUSEWHEEL:
+            wheel_steps += event.y
+            wheel_x += event.x
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                camera.apply_zoom(ZOOM_STEP, tower.rooms, tower.basements)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                camera.apply_zoom(-ZOOM_STEP, tower.rooms, tower.basements)
+            elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                # Ctrl+Z undoes, Ctrl+Shift+Z redoes
+                (tower.redo if event.mod & pygame.KMOD_SHIFT else tower.undo)()
+            elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:
+                tower.redo()
+            elif panning and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                camera.scroll_x(SCROLL_X_STEP if event.key == pygame.K_RIGHT else -SCROLL_X_STEP)
+            elif event.key == pygame.K_F3:
+                PROFILER.toggle()
+                dirty.mark_all()
+            elif event.key == pygame.K_F4:
+                PROFILER.dump_csv(PROFILE_CSV)
+
+    if wheel_steps:
+        camera.scroll(wheel_steps, tower)
+    if panning and wheel_x:
+        camera.scroll_x(wheel_x * SCROLL_X_STEP)
+    return running
+
+def render_frame(screen, tower, camera, dirty, dirty_rendering=True, towers=None):
+    """
+    Draw one frame and push it to the display.
+
+    While a smooth camera is easing, the frame is the last rendered world
+    scaled into the current view, when that is cheaper than a full redraw.
+    """
+    if camera.animating and SNAPSHOT.worth_using():
+        mark_changes(dirty, tower, camera, towers)
+        dirty.pop()
         draw_background(screen, camera)
-        for room in tower.rooms:
-            room.draw(screen, camera)
-        draw_base(screen, camera)
-        for room in tower.basements:
-            room.draw(screen, camera)
-        draw_horizon(screen, camera)
-        draw_debug_info(screen, camera)
-
-        # Draw UI
-        build_button.draw(screen)
-        dig_button.draw(screen)
-        tower.resources.draw(screen)
+        SNAPSHOT.draw(screen, camera)
+        PROFILER.mark("rooms")
+        draw_ui(screen, tower, camera)
         pygame.display.flip()
+        # Redraw for real once the camera settles
+        dirty.mark_all()
+        return
 
+    if not dirty_rendering:
+        draw_scene(screen, tower, camera, towers)
+        pygame.display.flip()
+        return
+
+    mark_changes(dirty, tower, camera, towers)
+    if PROFILER.enabled:
+        dirty.mark(PROFILE_OVERLAY)
+    if dirty:
+        rects = dirty.pop()
+        screen.set_clip(rects[0].unionall(rects[1:]))
+        draw_scene(screen, tower, camera, towers)
+        screen.set_clip(None)
+        pygame.display.update(rects)
+
+def main(dirty_rendering=True, save_path=None):
+    """
+    Run the game loop.
+
+    Args:
+        dirty_rendering (bool): Repaint only changed screen regions and skip
+            idle frames. When False, the whole scene is redrawn and flipped
+            every tick.
+        save_path (str): World directory to load chunks from and autosave
+            them to. Without one, the world lives in a temporary directory.
+    """
+    running = True
+    screen = init_display()
+    clock = pygame.time.Clock()
+
+    # Load the chunks around the starting view; the player starts at the home tower
+    world = World(save_path or tempfile.mkdtemp(prefix="tower_world_"))
+    world.stream(camera)
+    tower = world.chunk(0).tower
+    dirty = DirtyRegions(WIDTH, HEIGHT)
+
+    while running:
+        # Every loaded tower's economy runs on its own fixed timestep, independent of FPS
+        dt = clock.tick(FPS) / 1000
+        world.update(dt)
+        camera.update(dt)
+
+        events = pygame.event.get()
+        idle = (not events and not dirty and not camera.moved
+                and not tower.resources.changed and tower.changed_area is None)
+        if dirty_rendering and idle:
+            # Nothing changed: sleep until the next event or economy tick
+            timeout = int(world.seconds_until_next_tick() * 1000) + 1
+            events = [pygame.event.wait(timeout)] + pygame.event.get()
+
+        PROFILER.start_frame()
+        running = handle_events(events, tower, camera, dirty)
+        if camera.moved:
+            world.stream(camera)
+            # Build and dig act on the tower under the screen center
+            tower = world.tower_at(camera.center_x())
+            tower.resources.changed = True
+        PROFILER.mark("events")
+        render_frame(screen, tower, camera, dirty, dirty_rendering, world.visible_towers(camera))
+        PROFILER.end_frame()
+        world.flush()
+
+    world.close()
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
+    main(save_path=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,280 @@
+"""
+Headless benchmark for the tower game loop.
+
+Runs the real event handling and rendering code under SDL's dummy video
+driver, replaying a scripted input stream against towers of several sizes,
+and writes per-frame timing percentiles to JSON so runs can be diffed.
+Each run also times undoing and redoing UNDO_OPS single-room builds.
+
+    python tower_bench.py --sizes 10 10000 1000000 --frames 600 --out bench.json
+
+A run's edits can be saved as a command log and replayed later, so a
+session is rebuilt exactly instead of from the synthetic tower:
+
+    python tower_bench.py --sizes 10000 --save-log session.log
+    python tower_bench.py --replay session.log
+
+--world measures the loop main() runs instead: a smooth WorldCamera over a
+streamed World, zooming all the way out and panning across chunks, with
+the home chunk holding the sized tower. It also reports World.stream() time.
+
+    python tower_bench.py --world --sizes 10 1000000
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Must be set before pygame creates a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import tower as game
+from tower_cam import Camera, WorldCamera
+from tower_config import FPS, HEIGHT, WIDTH
+from tower_history import CommandLog
+from tower_model import Tower
+from tower_world import World
+
+DEFAULT_SIZES = (10, 10_000, 1_000_000)
+DEFAULT_FRAMES = 600
+UNDO_OPS = 10_000
+
+# One action per frame, repeated for the length of the run
+SCRIPT = (
+    "build", None, "dig", None,
+    "scroll_up", "scroll_up", "scroll_up", None,
+    "zoom_out", None, "zoom_out", None,
+    "scroll_down", "scroll_down", "scroll_down", None,
+    "zoom_in", None, "zoom_in", None,
+)
+
+# World mode: zoom fully out, pan across chunks while the camera eases, come back
+WORLD_SCRIPT = (
+    ("build", None, "dig", None)
+    + ("zoom_out", None) * 12
+    + ("scroll_right", None, None) * 6
+    + ("scroll_left", None, None) * 6
+    + ("zoom_in", None) * 12
+)
+
+
+def script_events(action):
+    """Translate a script action into the pygame events a player would send."""
+    if action == "build":
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=game.build_button.rect.center, button=1)]
+    if action == "dig":
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=game.dig_button.rect.center, button=1)]
+    if action == "scroll_up":
+        return [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1, flipped=False)]
+    if action == "scroll_down":
+        return [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1, flipped=False)]
+    if action == "zoom_in":
+        return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_PLUS, mod=0)]
+    if action == "zoom_out":
+        return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_MINUS, mod=0)]
+    if action == "scroll_right":
+        return [pygame.event.Event(pygame.MOUSEWHEEL, x=1, y=0, flipped=False)]
+    if action == "scroll_left":
+        return [pygame.event.Event(pygame.MOUSEWHEEL, x=-1, y=0, flipped=False)]
+    return []
+
+
+def build_tower(size, tower=None):
+    """Fill a tower (a new one by default) with size rooms, split between floors and basements."""
+    tower = tower or Tower()
+    tower.add_rooms(size // 2)
+    tower.add_basements(size - size // 2)
+    return tower
+
+
+def percentile(samples, pct):
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(timings):
+    return {
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "max_ms": max(timings),
+    }
+
+
+def time_undo(tower, ops=UNDO_OPS):
+    """
+    Build ops single rooms, then time undoing and redoing all of them.
+
+    Returns:
+        tuple: (undo ms, redo ms).
+    """
+    for _ in range(ops):
+        game.build_room(tower)
+    start = time.perf_counter()
+    tower.undo(ops)
+    undo_ms = (time.perf_counter() - start) * 1000.0
+    start = time.perf_counter()
+    tower.redo(ops)
+    return undo_ms, (time.perf_counter() - start) * 1000.0
+
+
+def run(size, frames, screen, dirty_rendering=True, log=None, save_log=None):
+    """
+    Replay the script for a number of frames against a tower of size rooms.
+
+    Args:
+        log (CommandLog): Build the tower by replaying this log instead.
+        save_log (str): Write the tower's command log here after the frames.
+
+    Returns:
+        dict: Timing summary in milliseconds.
+    """
+    start = time.perf_counter()
+    if log is None:
+        tower = build_tower(size)
+    else:
+        tower = Tower()
+        log.replay(tower)
+        size = len(tower.rooms) + len(tower.basements)
+    build_seconds = time.perf_counter() - start
+
+    camera = Camera()
+    dirty = game.DirtyRegions(WIDTH, HEIGHT)
+    pygame.event.clear()
+
+    timings = []
+    for frame in range(frames):
+        for event in script_events(SCRIPT[frame % len(SCRIPT)]):
+            pygame.event.post(event)
+
+        start = time.perf_counter()
+        game.handle_events(pygame.event.get(), tower, camera, dirty)
+        game.render_frame(screen, tower, camera, dirty, dirty_rendering)
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+    if save_log:
+        tower.history.save(save_log)
+    undo_ms, redo_ms = time_undo(tower)
+    return dict(
+        rooms=size,
+        frames=frames,
+        build_seconds=build_seconds,
+        **summarize(timings),
+        undo_ops=UNDO_OPS,
+        undo_ms=undo_ms,
+        redo_ms=redo_ms,
+    )
+
+
+def run_world(size, frames, screen, dirty_rendering=True):
+    """
+    Replay WORLD_SCRIPT through the same steps as main(): a smooth
+    WorldCamera easing at a fixed FPS, World.stream() whenever it moves,
+    every resident economy ticking and the snapshot render path.
+
+    Returns:
+        dict: Timing summary in milliseconds, with World.stream() percentiles.
+    """
+    directory = tempfile.mkdtemp(prefix="tower_bench_world_")
+    try:
+        world = World(directory)
+        start = time.perf_counter()
+        tower = build_tower(size, world.chunk(0).tower)
+        build_seconds = time.perf_counter() - start
+
+        camera = WorldCamera(smooth=True)
+        camera.reset()
+        world.stream(camera)
+        dirty = game.DirtyRegions(WIDTH, HEIGHT)
+        pygame.event.clear()
+
+        dt = 1 / FPS
+        timings = []
+        stream_timings = []
+        for frame in range(frames):
+            for event in script_events(WORLD_SCRIPT[frame % len(WORLD_SCRIPT)]):
+                pygame.event.post(event)
+
+            start = time.perf_counter()
+            world.update(dt)
+            camera.update(dt)
+            game.handle_events(pygame.event.get(), tower, camera, dirty)
+            if camera.moved:
+                stream_start = time.perf_counter()
+                world.stream(camera)
+                stream_timings.append((time.perf_counter() - stream_start) * 1000.0)
+                tower = world.tower_at(camera.center_x())
+                tower.resources.changed = True
+            game.render_frame(screen, tower, camera, dirty, dirty_rendering, world.visible_towers(camera))
+            timings.append((time.perf_counter() - start) * 1000.0)
+        world.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    stream = summarize(stream_timings) if len(stream_timings) > 1 else {}
+    return dict(
+        rooms=size,
+        frames=frames,
+        build_seconds=build_seconds,
+        **summarize(timings),
+        stream_calls=len(stream_timings),
+        stream_p99_ms=stream.get("p99_ms"),
+        stream_max_ms=stream.get("max_ms"),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the tower game loop headlessly.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Tower sizes in rooms")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Frames to replay per size")
+    parser.add_argument("--full-redraw", action="store_true", help="Redraw and flip every frame")
+    parser.add_argument("--out", default=None, help="Write results to this JSON file")
+    parser.add_argument("--save-log", default=None, help="Write the last run's command log to this file")
+    parser.add_argument("--replay", default=None, help="Build the tower from this command log instead of --sizes")
+    parser.add_argument("--world", action="store_true",
+                        help="Benchmark main()'s loop: smooth WorldCamera over a streamed World")
+    args = parser.parse_args(argv)
+
+    screen = game.init_display()
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "video_driver": pygame.display.get_driver(),
+        "dirty_rendering": not args.full_redraw,
+        "mode": "world" if args.world else "tower",
+        "runs": [],
+    }
+    if args.world:
+        for size in args.sizes:
+            result = run_world(size, args.frames, screen, dirty_rendering=not args.full_redraw)
+            results["runs"].append(result)
+            stream = (f", stream p99 {result['stream_p99_ms']:.2f} ms"
+                      if result["stream_p99_ms"] is not None else "")
+            print(f"{result['rooms']:>9} rooms: p50 {result['p50_ms']:.2f} ms, "
+                  f"p95 {result['p95_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms{stream}")
+    log = CommandLog.load(args.replay) if args.replay else None
+    for size in ([] if args.world else [None] if log else args.sizes):
+        result = run(size, args.frames, screen, dirty_rendering=not args.full_redraw,
+                     log=log, save_log=args.save_log)
+        results["runs"].append(result)
+        print(f"{result['rooms']:>9} rooms: p50 {result['p50_ms']:.2f} ms, "
+              f"p95 {result['p95_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+              f"undo {result['undo_ops']} ops {result['undo_ms']:.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    pygame.quit()
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,28 +1,152 @@
+import functools
+
 from tower_config import (
     WIDTH, HEIGHT,
     UI_LEFT_MARGIN, UI_RIGHT_MARGIN,
     ROOM_WIDTH, ROOM_HEIGHT, ROOM_SPACING,
-    WORLD_HORIZON_Y
+    WORLD_HORIZON_Y,
+    CAMERA_EASE_SECONDS
 )
 
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+def animated(method):
+    """
+    Make a camera move ease in over several frames when the camera is smooth.
+
+    The move is applied to the camera's destination, and the shown state
+    then travels there in update(). Moves made mid-animation build on the
+    destination, so quick repeated zooms add up rather than being lost.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.smooth or self._in_move:
+            return method(self, *args, **kwargs)
+        shown = self.view_state()
+        if self.target is not None:
+            self._show(self.target)
+        self._in_move = True
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self._in_move = False
+        self.target = self.view_state()
+        self._start = shown
+        self._elapsed = 0.0
+        self._show(shown)
+        return result
+    return wrapper
+
 class Camera:
-    def __init__(self):
-        """Initialize camera with default values."""
+    # A plain camera looks at a single tower column and never scrolls sideways
+    offset_x = 0
+
+    def __init__(self, smooth=False, ease_seconds=CAMERA_EASE_SECONDS):
+        """
+        Initialize camera with default values.
+
+        Args:
+            smooth (bool): Ease zoom and scroll changes over ease_seconds
+                instead of snapping; call update() every frame.
+        """
+        self.smooth = smooth
+        self.ease_seconds = ease_seconds
+        self.target = None      # View state being eased towards, see view_state()
+        self._start = None
+        self._elapsed = 0.0
+        self._in_move = False
+        self._fit_key = None    # Room store versions the cached fit belongs to
+        self._fit = None
         self.reset()
 
     def reset(self):
         """Reset the camera to its default position and zoom."""
         self.offset_y = HEIGHT // 2
         self.zoom = 1.0
+        self.moved = True
+        self.target = None
+
+    @property
+    def animating(self):
+        return self.target is not None
+
+    def view_state(self):
+        """
+        The view as (world x, world y at the screen center, zoom).
+
+        Easing between these rather than raw offsets keeps the point under
+        the screen center moving in a straight line while the zoom changes.
+        """
+        return (WIDTH / (2 * self.zoom) - self.offset_x,
+                HEIGHT / (2 * self.zoom) - self.offset_y,
+                self.zoom)
+
+    def _show(self, state):
+        _, center_y, zoom = state
+        self.zoom = zoom
+        self.offset_y = HEIGHT / (2 * zoom) - center_y
+        self.moved = True
+
+    def update(self, dt):
+        """
+        Advance an eased move by dt seconds.
+
+        Returns:
+            bool: True while the camera is still moving.
+        """
+        if self.target is None:
+            return False
+        self._elapsed += dt
+        t = min(1.0, self._elapsed / self.ease_seconds) if self.ease_seconds > 0 else 1.0
+        if t >= 1.0:
+            self.finish()
+            return False
+        k = ease_out_cubic(t)
+        start, end = self._start, self.target
+        # Ease the zoom geometrically so zooming in and out feel symmetric
+        self._show((start[0] + (end[0] - start[0]) * k,
+                    start[1] + (end[1] - start[1]) * k,
+                    start[2] * (end[2] / start[2]) ** k))
+        return True
+
+    def finish(self):
+        """Jump to the end of any eased move."""
+        if self.target is not None:
+            self._show(self.target)
+            self.target = None
 
     def get(self):
         """Get the current camera state as a tuple (offset_y, zoom)."""
         return self.offset_y, self.zoom
 
+    @animated
     def set(self, offset, zoom):
         """Set the camera position and zoom level."""
         self.offset_y = offset
         self.zoom = zoom
+        self.moved = True
+
+    def fit_bounds(self, tower_rooms, basement_rooms):
+        """
+        Zoom and vertical midpoint that fit the entire tower and basement.
+
+        Cached until either room store changes.
+
+        Returns:
+            tuple: (min_zoom, mid_world_y), or None when there are no rooms.
+        """
+        key = (id(tower_rooms), tower_rooms.version, id(basement_rooms), basement_rooms.version)
+        if key != self._fit_key:
+            self._fit_key = key
+            if not tower_rooms and not basement_rooms:
+                self._fit = None
+            else:
+                top = tower_rooms.y[-1] if tower_rooms else WORLD_HORIZON_Y
+                bottom = basement_rooms.y[-1] if basement_rooms else WORLD_HORIZON_Y
+                total_height = (bottom - top + ROOM_HEIGHT + ROOM_SPACING)
+                self._fit = (min(1.0, (HEIGHT - 100) / total_height), (top + bottom) / 2)
+        return self._fit
 
     def calculate_min_zoom_only(self, tower_rooms, basement_rooms):
         """
@@ -31,41 +155,35 @@ class Camera:
         Returns:
             float: The minimum zoom level (clamped to max 1.0).
         """
-        if not tower_rooms and not basement_rooms:
-            return 1.0
-
-        top = tower_rooms[-1].rect.y if tower_rooms else WORLD_HORIZON_Y
-        bottom = basement_rooms[-1].rect.y if basement_rooms else WORLD_HORIZON_Y
-
-        total_height = (bottom - top + ROOM_HEIGHT + ROOM_SPACING)
-        return min(1.0, (HEIGHT - 100) / total_height)
+        fit = self.fit_bounds(tower_rooms, basement_rooms)
+        return fit[0] if fit else 1.0
 
+    @animated
     def calculate_min_zoom_and_scroll(self, tower_rooms, basement_rooms):
         """
         Auto-adjust zoom and scroll to fit the current tower and basement in view.
         """
-        if not tower_rooms and not basement_rooms:
+        self.moved = True
+        fit = self.fit_bounds(tower_rooms, basement_rooms)
+        if fit is None:
             self.zoom = 1.0
             self.offset_y = HEIGHT // 2
             return
 
-        top = tower_rooms[-1].rect.y if tower_rooms else WORLD_HORIZON_Y
-        bottom = basement_rooms[-1].rect.y if basement_rooms else WORLD_HORIZON_Y
-
-        total_height = (bottom - top + ROOM_HEIGHT + ROOM_SPACING)
-        self.zoom = min(1.0, (HEIGHT - 100) / total_height)
-
-        mid_world_y = (top + bottom) / 2
+        self.zoom, mid_world_y = fit
         screen_mid_y = HEIGHT / (2 * self.zoom)
         self.offset_y = screen_mid_y - mid_world_y
 
+    @animated
     def calculate_max_zoom(self):
         """
         Set the maximum zoom level based on usable UI width.
         """
         usable_width = WIDTH - UI_LEFT_MARGIN - UI_RIGHT_MARGIN
         self.zoom = min(2.0, usable_width / ROOM_WIDTH)
+        self.moved = True
 
+    @animated
     def apply_zoom(self, amount, tower_rooms, basement_rooms):
         """
         Apply a zoom increment while respecting min/max zoom bounds.
@@ -77,41 +195,94 @@ class Camera:
         max_zoom = min(2.0, usable_width / ROOM_WIDTH)
         min_zoom = self.calculate_min_zoom_only(tower_rooms, basement_rooms)
         self.zoom = max(min_zoom, min(max_zoom, self.zoom + amount))
+        self.moved = True
+
+    def handle_mouse_scroll(self, event, tower):
+        self.scroll(event.y, tower)
 
-    def handle_mouse_scroll(self, event, tower_rooms, basement_rooms):
+    @animated
+    def scroll(self, wheel_steps, tower):
         """
-        Handle vertical camera scrolling with correct bounds:
-        - Scroll up: Stop when topmost room bottom is at top of screen.
-        - Scroll down: Stop when bottommost room top is at bottom of screen.
-        - If no rooms, horizon must remain visible.
+        Scroll by a number of wheel steps and clamp to the tower's extent.
+
+        Several wheel events can be summed into one call, so a burst of
+        input costs a single clamp.
         """
-        scroll_amount = (30 / self.zoom) * (-event.y)
+        scroll_amount = (0.5 / self.zoom) * -wheel_steps
+        self.offset_y += scroll_amount
+        self.moved = True
+
+        # World Y positions
+        top_y = tower.get_peak()        # e.g. -120
+        bottom_y = tower.get_bottom()   # e.g. 80
         visible_height = HEIGHT / self.zoom
 
-        # Get topmost room's bottom (visible edge)
-        if tower_rooms:
-            top_room_bottom = tower_rooms[-1].rect.y + ROOM_HEIGHT
-        else:
-            top_room_bottom = WORLD_HORIZON_Y
-
-        # Get bottommost room's top
-        if basement_rooms:
-            bottom_room_top = basement_rooms[-1].rect.y
-        else:
-            bottom_room_top = WORLD_HORIZON_Y
-
-        # Calculate bounds:
-        # Top of screen must be ≤ top_room_bottom → offset_y ≤ top_room_bottom
-        min_offset_y = top_room_bottom
-
-        # Bottom of screen must be ≥ bottom_room_top → offset_y ≥ bottom_room_top - visible_height
-        max_offset_y = bottom_room_top - visible_height
-
-        # Prevent flipped bounds if rooms are close together
-        if max_offset_y < min_offset_y:
-            mid_y = (top_room_bottom + bottom_room_top) / 2 - visible_height / 2
-            self.offset_y = mid_y
-            return
+        # Compute screen edges in world space
+        screen_top_world_y = -self.offset_y
+        screen_bottom_world_y = screen_top_world_y + visible_height
+
+        # Clamp: don’t let screen show above top of tower
+        if screen_top_world_y < top_y:
+            self.offset_y = -top_y
+        # Clamp: don’t let screen show below bottom of tower
+        elif screen_bottom_world_y > bottom_y:
+            self.offset_y = -(bottom_y - visible_height)
+
 
-        # Apply scroll and clamp
-        self.offset_y = max(min_offset_y, min(max_offset_y, self.offset_y + scroll_amount))
+class WorldCamera(Camera):
+    """
+    Camera that also scrolls horizontally across a world of many towers.
+
+    Screen x is (world x + offset_x) * zoom, mirroring the vertical axis.
+    Zooming keeps the world x at the center of the screen fixed.
+    """
+
+    def reset(self):
+        super().reset()
+        self.offset_x = 0
+
+    def _show(self, state):
+        super()._show(state)
+        self.offset_x = WIDTH / (2 * self.zoom) - state[0]
+
+    def get_x(self):
+        """Get the horizontal camera state as a tuple (offset_x, zoom)."""
+        return self.offset_x, self.zoom
+
+    def view_span(self):
+        """World x range (left, right) currently on screen."""
+        left = -self.offset_x
+        return left, left + WIDTH / self.zoom
+
+    def center_x(self):
+        """World x at the middle of the screen."""
+        return WIDTH / (2 * self.zoom) - self.offset_x
+
+    @animated
+    def scroll_x(self, pixels):
+        """Scroll sideways by a number of screen pixels (positive moves right)."""
+        self.offset_x -= pixels / self.zoom
+        self.moved = True
+
+    @animated
+    def center_on(self, world_x):
+        """Scroll sideways so world_x is at the middle of the screen."""
+        self.offset_x = WIDTH / (2 * self.zoom) - world_x
+        self.moved = True
+
+    def _keep_center(self, change_zoom, *args):
+        center = self.center_x()
+        change_zoom(*args)
+        self.center_on(center)
+
+    @animated
+    def calculate_min_zoom_and_scroll(self, tower_rooms, basement_rooms):
+        self._keep_center(super().calculate_min_zoom_and_scroll, tower_rooms, basement_rooms)
+
+    @animated
+    def calculate_max_zoom(self):
+        self._keep_center(super().calculate_max_zoom)
+
+    @animated
+    def apply_zoom(self, amount, tower_rooms, basement_rooms):
+        self._keep_center(super().apply_zoom, amount, tower_rooms, basement_rooms)
@@ -1,5 +1,3 @@
-import pygame
-
 # Screen dimensions
 WIDTH = 800
 HEIGHT = 600
@@ -25,6 +23,37 @@ ROOM_WIDTH = 120
 ROOM_HEIGHT = 40
 ROOM_SPACING = 1
 
+# World chunks: each chunk is one tower plot, CHUNK_WIDTH world pixels wide
+CHUNK_WIDTH = WIDTH
+# Chunks kept loaded beyond the edges of the view
+CHUNK_MARGIN = 1
+# Hard cap on loaded chunks, so memory stays bounded at any zoom
+MAX_RESIDENT_CHUNKS = 9
+# Screen pixels panned per arrow key press or horizontal wheel step
+SCROLL_X_STEP = 200
+
+# Rooms built or dug per shift-click
+BULK_BUILD_COUNT = 100
+
+# Camera
+ZOOM_STEP = 0.1
+# Below this zoom, runs of identical rooms are drawn as single unlabeled blocks
+LOD_ZOOM = 0.25
+# Smooth camera: seconds a zoom or scroll takes to ease into place
+CAMERA_EASE_SECONDS = 0.2
+
 # Font
-pygame.init()
-FONT = pygame.font.SysFont(None, 24)
\ No newline at end of file
+FONT_SIZE = 24
+_font = None
+
+def get_font():
+    """
+    Get the UI font, initializing pygame's font module on first use.
+    Kept lazy so importing the config does not start SDL.
+    """
+    global _font
+    if _font is None:
+        import pygame
+        pygame.font.init()
+        _font = pygame.font.SysFont(None, FONT_SIZE)
+    return _font
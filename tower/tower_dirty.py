@@ -0,0 +1,42 @@
+import pygame
+
+
+class DirtyRegions:
+    """
+    Collects the screen areas that need repainting before the next update.
+
+    Starts fully dirty so the first frame paints the whole window.
+    """
+
+    def __init__(self, width, height):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.rects = []
+        self.full = True
+
+    def mark(self, rect):
+        """Mark a screen rectangle as needing a repaint."""
+        if self.full:
+            return
+        rect = self.screen_rect.clip(rect)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+
+    def mark_all(self):
+        """Mark the whole screen as needing a repaint."""
+        self.full = True
+        self.rects.clear()
+
+    def pop(self):
+        """
+        Return the dirty rectangles and reset the tracker.
+
+        Returns:
+            list[pygame.Rect]: Areas to repaint, empty when nothing changed.
+        """
+        rects = [self.screen_rect.copy()] if self.full else self.rects
+        self.full = False
+        self.rects = []
+        return rects
+
+    def __bool__(self):
+        return self.full or bool(self.rects)
@@ -0,0 +1,85 @@
+"""
+Fixed-timestep resource economy for the tower.
+
+Every tick, each room produces (positive rate) or consumes (negative rate)
+resources. The simulation runs on its own clock, independent of the render
+frame rate, and production is computed from per-type room counts, so a
+tick costs the same for ten rooms or a million.
+"""
+
+# Seconds of game time per economy tick
+TICK_SECONDS = 1.0
+
+# Per-tick resource change for one room of each type
+ROOM_RATES = {
+    "Room": {"mana": 2, "gold": 1, "earth": -1},
+    "Basement": {"earth": 1, "stone": 1},
+}
+
+
+class Economy:
+    """
+    Advances a tower's resources in fixed ticks.
+
+    Args:
+        tower (Tower): The tower whose rooms produce and whose resources change.
+        rates (dict): Room type -> {resource: change per tick}.
+        tick_seconds (float): Length of one tick.
+    """
+
+    def __init__(self, tower, rates=ROOM_RATES, tick_seconds=TICK_SECONDS):
+        self.tower = tower
+        self.rates = rates
+        self.tick_seconds = tick_seconds
+        self.ticks = 0
+        self._accumulator = 0.0
+
+    def net_per_tick(self):
+        """
+        Sum the per-tick change of every resource over all rooms.
+
+        Returns:
+            dict: resource -> net change per tick.
+        """
+        net = {}
+        for store in (self.tower.rooms, self.tower.basements):
+            for room_type, count in store.count_by_type().items():
+                for resource, rate in self.rates.get(room_type, {}).items():
+                    net[resource] = net.get(resource, 0) + rate * count
+        return net
+
+    def advance(self, ticks):
+        """
+        Apply several ticks of production at once.
+
+        Room counts don't change between ticks, so n ticks are n times the
+        net rate. Resources are floored at zero.
+        """
+        if ticks <= 0:
+            return
+        resources = self.tower.resources
+        for resource, rate in self.net_per_tick().items():
+            amount = max(rate * ticks, -getattr(resources, resource))
+            if amount:
+                resources.add(resource, amount)
+        self.ticks += ticks
+
+    def update(self, dt):
+        """
+        Advance the simulation by dt seconds of real time.
+
+        Returns:
+            int: The number of whole ticks that ran.
+        """
+        self._accumulator += dt
+        ticks = int(self._accumulator // self.tick_seconds)
+        self._accumulator -= ticks * self.tick_seconds
+        self.advance(ticks)
+        return ticks
+
+    def catch_up(self, seconds):
+        """Run the ticks for a period the game was not running, e.g. since the last save."""
+        return self.update(max(0.0, seconds))
+
+    def seconds_until_next_tick(self):
+        return self.tick_seconds - self._accumulator
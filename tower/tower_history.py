@@ -0,0 +1,239 @@
+"""
+Undo/redo history for tower edits, kept as a compact command log.
+
+Every edit is one row across a set of typed arrays (about 56 bytes), so the
+log grows with the number of edits and never with the size of the tower.
+Undoing a command removes the rows it inserted; consecutive commands whose
+rows are adjacent are removed with a single slice deletion, which is what
+keeps undoing thousands of builds fast.
+
+Commands made inside Tower.edit() form one group and are undone together,
+e.g. a dig and the earth it yields. Resource changes are only recorded
+inside a group, so economy ticks never end up on the undo stack.
+
+The log is also a deterministic script: replay() applies it to another
+tower, and save()/load() move it through a file, which lets benchmarks
+reproduce a session exactly.
+"""
+import mmap
+import struct
+from array import array
+from contextlib import contextmanager
+
+from tower_save import RESOURCE_NAMES, write_array, read_array, write_tables, read_tables
+
+LOG_MAGIC = b"WTCL"
+LOG_VERSION = 1
+# magic, version, padding, command count, type count, color count
+LOG_HEADER = struct.Struct("<4sH2xQHH4x")
+
+OP_ROOMS = 1      # count rows inserted at index, y advancing by step
+OP_RESOURCE = 2   # delta added to a resource
+
+# Column name -> array typecode, in file order
+COLUMNS = (
+    ("op", "B"), ("start", "B"), ("store", "B"), ("resource", "B"),
+    ("index", "q"), ("count", "q"), ("delta", "q"),
+    ("x", "i"), ("y", "i"), ("step", "i"), ("width", "i"), ("height", "i"), ("cost", "i"),
+    ("type_id", "H"), ("color_id", "H"),
+)
+
+
+class CommandLog:
+    """
+    Undoable log of a tower's edits.
+
+    Commands before ``size`` are applied; any after it were undone and can
+    be redone until a new edit discards them.
+    """
+
+    def __init__(self):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.types = []
+        self.colors = []
+        self._type_ids = {}
+        self._color_ids = {}
+        self.size = 0
+        self._depth = 0          # Nesting of open groups
+        self._new_group = False  # Next command starts the open group
+        self._paused = False     # Applying the log itself; don't record
+
+    def __len__(self):
+        return self.size
+
+    def nbytes(self):
+        """Memory used by the command columns."""
+        return sum(len(column) * column.itemsize for column in self._columns())
+
+    def _columns(self):
+        return tuple(getattr(self, name) for name, _ in COLUMNS)
+
+    def _intern(self, table, ids, value):
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(table)
+            table.append(value)
+        return value_id
+
+    def clear(self):
+        for column in self._columns():
+            del column[:]
+        self.size = 0
+
+    @contextmanager
+    def group(self):
+        """Record the commands made inside the block as one undo step."""
+        if self._depth == 0:
+            self._new_group = True
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+
+    def _record(self, op, store=0, resource=0, index=0, count=0, delta=0,
+                x=0, y=0, step=0, width=0, height=0, cost=0, type_id=0, color_id=0):
+        if self._paused:
+            return
+        if self.size < len(self.op):
+            # A new edit discards whatever could have been redone
+            for column in self._columns():
+                del column[self.size:]
+        start = self._depth == 0 or self._new_group
+        self._new_group = False
+        row = (op, start, store, resource, index, count, delta, x, y, step, width, height, cost, type_id, color_id)
+        for column, value in zip(self._columns(), row):
+            column.append(value)
+        self.size += 1
+
+    def rooms_added(self, store_index, index, count, x, y, step, width, height, room_type, cost, color):
+        self._record(OP_ROOMS, store=store_index, index=index, count=count, x=x, y=y, step=step,
+                     width=width, height=height, cost=cost,
+                     type_id=self._intern(self.types, self._type_ids, room_type),
+                     color_id=self._intern(self.colors, self._color_ids, tuple(color[:3])))
+
+    def resource_changed(self, name, delta):
+        if self._depth:
+            self._record(OP_RESOURCE, resource=RESOURCE_NAMES.index(name), delta=delta)
+
+    def _group_end(self, first):
+        end = first + 1
+        while end < len(self.op) and not self.start[end]:
+            end += 1
+        return end
+
+    def undo(self, tower, steps=1):
+        """
+        Undo up to steps groups of edits.
+
+        Returns:
+            int: The number of groups undone.
+        """
+        stores = (tower.rooms, tower.basements)
+        pending = [None, None]   # Per store: (first row, row count) still to remove
+        taken = {}               # Resource -> amount to take back, applied once at the end
+        ops, starts, store_ids, indices, counts = self.op, self.start, self.store, self.index, self.count
+        undone = 0
+        self._paused = True
+        try:
+            while undone < steps and self.size:
+                first = self.size - 1
+                while first > 0 and not starts[first]:
+                    first -= 1
+                for i in range(self.size - 1, first - 1, -1):
+                    if ops[i] == OP_ROOMS:
+                        store, index, count = store_ids[i], indices[i], counts[i]
+                        block = pending[store]
+                        if block and block[0] == index + count:
+                            pending[store] = (index, count + block[1])
+                        else:
+                            if block:
+                                tower.remove_rows(stores[store], *block)
+                            pending[store] = (index, count)
+                    else:
+                        name = RESOURCE_NAMES[self.resource[i]]
+                        # Resources never go negative, so take back only what is left
+                        delta = min(self.delta[i], getattr(tower.resources, name) - taken.get(name, 0))
+                        taken[name] = taken.get(name, 0) + delta
+                        self.delta[i] = delta
+                self.size = first
+                undone += 1
+            for store, block in enumerate(pending):
+                if block:
+                    tower.remove_rows(stores[store], *block)
+            for name, delta in taken.items():
+                if delta:
+                    tower.resources.add(name, -delta)
+        finally:
+            self._paused = False
+        return undone
+
+    def redo(self, tower, steps=1):
+        """
+        Redo up to steps groups of undone edits.
+
+        Returns:
+            int: The number of groups redone.
+        """
+        redone = 0
+        self._paused = True
+        try:
+            while redone < steps and self.size < len(self.op):
+                end = self._group_end(self.size)
+                for i in range(self.size, end):
+                    self._apply(tower, i)
+                self.size = end
+                redone += 1
+        finally:
+            self._paused = False
+        return redone
+
+    def _apply(self, tower, i):
+        if self.op[i] == OP_ROOMS:
+            store = tower.basements if self.store[i] else tower.rooms
+            args = (self.x[i], self.y[i])
+            room_type, color = self.types[self.type_id[i]], self.colors[self.color_id[i]]
+            if self.count[i] == 1:
+                room = store.view(*args, self.width[i], self.height[i], room_type, self.cost[i], color)
+                tower.insert_room(store, self.index[i], room)
+            else:
+                tower.stack(store, self.count[i], *args, self.step[i], self.width[i], self.height[i],
+                            room_type, self.cost[i], color)
+        else:
+            tower.resources.add(RESOURCE_NAMES[self.resource[i]], self.delta[i])
+
+    def replay(self, tower):
+        """Apply every applied command, in order and with its grouping, to another tower."""
+        first = 0
+        while first < self.size:
+            end = min(self._group_end(first), self.size)
+            with tower.edit():
+                for i in range(first, end):
+                    self._apply(tower, i)
+            first = end
+
+    def save(self, path):
+        """Write the applied commands to a file."""
+        with open(path, "wb") as f:
+            f.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.size, len(self.types), len(self.colors)))
+            write_tables(f, self.types, self.colors)
+            for column in self._columns():
+                write_array(f, column[:self.size])
+
+    @classmethod
+    def load(cls, path):
+        """Read a log written by save()."""
+        log = cls()
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, version, size, type_count, color_count = LOG_HEADER.unpack_from(buffer, 0)
+            if magic != LOG_MAGIC or version != LOG_VERSION:
+                raise ValueError(f"{path} is not a tower command log")
+            log.types, log.colors, offset = read_tables(buffer, LOG_HEADER.size, type_count, color_count)
+            for name, typecode in COLUMNS:
+                column, offset = read_array(buffer, offset, typecode, size)
+                setattr(log, name, column)
+        log._type_ids = {value: i for i, value in enumerate(log.types)}
+        log._color_ids = {value: i for i, value in enumerate(log.colors)}
+        log.size = size
+        return log
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+import pygame
+
+# Zoom levels are snapped to this step before being used as a cache key,
+# so continuous zooming reuses a handful of scaled labels.
+ZOOM_BUCKET_STEP = 0.1
+MAX_CACHED_LABELS = 512
+
+
+def zoom_bucket(zoom, step=ZOOM_BUCKET_STEP):
+    """Snap a zoom level to the nearest bucket (never below one step)."""
+    return max(step, round(zoom / step) * step)
+
+
+class LabelCache:
+    """
+    LRU cache of rendered text surfaces.
+
+    Entries are keyed by (text, color, font, zoom bucket), so every caller
+    rendering the same string with the same font shares one surface.
+    """
+
+    def __init__(self, max_size=MAX_CACHED_LABELS):
+        self.max_size = max_size
+        self._labels = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, zoom=1.0):
+        """
+        Return a surface for text, rendering it only on a cache miss.
+
+        Args:
+            font (pygame.font.Font): Font to render with.
+            text (str): The label text.
+            color (tuple): RGB text color.
+            zoom (float): Camera zoom; the label is scaled to its bucket.
+        """
+        bucket = zoom_bucket(zoom) if zoom != 1.0 else 1.0
+        key = (text, color, font, bucket)
+        label = self._labels.get(key)
+        if label is not None:
+            self._labels.move_to_end(key)
+            self.hits += 1
+            return label
+
+        self.misses += 1
+        label = font.render(text, True, color)
+        if bucket != 1.0:
+            w, h = label.get_size()
+            label = pygame.transform.smoothscale(label, (max(1, int(w * bucket)), max(1, int(h * bucket))))
+        self._labels[key] = label
+        if len(self._labels) > self.max_size:
+            self._labels.popitem(last=False)
+        return label
+
+    def clear(self):
+        self._labels.clear()
+
+    def __len__(self):
+        return len(self._labels)
+
+
+# Shared by rooms, buttons, resources and the debug overlay
+LABELS = LabelCache()
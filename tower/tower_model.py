@@ -0,0 +1,241 @@
+"""
+World model for the tower game: rooms, resources and the tower itself.
+
+Nothing here imports pygame, so tools and tests can use the model without
+starting SDL. Rendering lives in tower.py.
+"""
+from bisect import bisect_left, bisect_right
+from operator import neg
+
+from tower_config import (
+    WIDTH, HEIGHT,
+    ROOM_WIDTH, ROOM_HEIGHT, ROOM_SPACING,
+    WORLD_HORIZON_Y
+)
+from tower_history import CommandLog
+from tower_store import RoomStore, RoomView
+
+
+class Room(RoomView):
+    """
+    A room in the tower, stored as a row of the tower's RoomStore.
+    """
+
+    __slots__ = ()
+
+
+class Resources:
+    def __init__(self):
+        self.mana = 0
+        self.earth = 0
+        self.wood = 0
+        self.stone = 0
+        self.gold = 0
+        self.changed = True
+        self.journal = None  # Autosave recording changes, if any
+        self.history = None  # CommandLog of the owning tower, if any
+
+    def add(self, resource, amount):
+        if hasattr(self, resource):
+            setattr(self, resource, getattr(self, resource) + amount)
+            self.changed = True
+            if self.journal:
+                self.journal.resource_changed(resource, amount)
+            if self.history:
+                self.history.resource_changed(resource, amount)
+
+    def spend(self, resource, amount):
+        if hasattr(self, resource) and getattr(self, resource) >= amount:
+            setattr(self, resource, getattr(self, resource) - amount)
+            self.changed = True
+            if self.journal:
+                self.journal.resource_changed(resource, -amount)
+            if self.history:
+                self.history.resource_changed(resource, -amount)
+            return True
+        return False
+
+    def to_dict(self):
+        return {
+            "mana": self.mana,
+            "earth": self.earth,
+            "wood": self.wood,
+            "stone": self.stone,
+            "gold": self.gold
+        }
+
+
+class Tower:
+    def __init__(self, origin_x=0):
+        self.origin_x = origin_x            # World x of the left edge of the tower's plot
+        self.rooms = RoomStore(Room)        # Rooms above the horizon
+        self.basements = RoomStore(Room)    # Rooms below the horizon
+        self.resources = Resources()
+        # World-space (left, top, right, bottom) covering rooms added since
+        # the last frame, or None when nothing changed.
+        self.changed_area = None
+        self.journal = None  # Autosave recording changes, if any
+        self.history = CommandLog()  # Undo/redo log of edits
+        self.resources.history = self.history
+
+    def _mark_changed(self, left, top, right, bottom):
+        if self.changed_area:
+            old_left, old_top, old_right, old_bottom = self.changed_area
+            left, top = min(left, old_left), min(top, old_top)
+            right, bottom = max(right, old_right), max(bottom, old_bottom)
+        self.changed_area = (left, top, right, bottom)
+
+    def insert_room(self, store, index, room):
+        """Insert a room into store before row index."""
+        store_index = 0 if store is self.rooms else 1
+        self._mark_changed(room.x, room.y, room.x + room.width, room.y + room.height)
+        store.insert(index, room.x, room.y, room.width, room.height, room.type, room.cost, room.color)
+        if self.journal:
+            self.journal.room_added(store_index, room)
+        self.history.rooms_added(store_index, index, 1, room.x, room.y, 0, room.width, room.height,
+                                 room.type, room.cost, room.color)
+
+    def add_room(self, room):
+        self.insert_room(self.rooms, bisect_right(self.rooms.y, -room.y, key=neg), room)
+
+    def add_basement(self, room):
+        self.insert_room(self.basements, bisect_right(self.basements.y, room.y), room)
+
+    def remove_rows(self, store, index, count):
+        """Remove count rooms from store starting at row index."""
+        end = min(len(store), index + count)
+        if index < 0 or end <= index:
+            return
+        xs, ys, widths, heights = store.x, store.y, store.width, store.height
+        # Rows are ordered by y, so the first and last rows bound the area
+        top = min(ys[index], ys[end - 1])
+        bottom = max(ys[index] + heights[index], ys[end - 1] + heights[end - 1])
+        self._mark_changed(xs[index], top, xs[index] + widths[index], bottom)
+        store.delete(index, end - index)
+        if self.journal:
+            self.journal.rooms_removed(0 if store is self.rooms else 1, index, end - index)
+
+    def stack(self, store, count, x, y, step, width, height, room_type, cost, color):
+        """
+        Append count identical rooms to store, starting at y and moving by step.
+
+        The store grows in bulk and the change area and journal get a single
+        entry, so the bookkeeping is the same for one room or a million.
+        """
+        if count <= 0:
+            return
+        index = len(store)
+        store.extend_stacked(count, x, y, step, width, height, room_type, cost, color)
+        last_y = y + step * (count - 1)
+        self._mark_changed(x, min(y, last_y), x + width, max(y, last_y) + height)
+        store_index = 0 if store is self.rooms else 1
+        if self.journal:
+            self.journal.rooms_stacked(store_index, count, x, y, step, width, height, room_type, cost, color)
+        self.history.rooms_added(store_index, index, count, x, y, step, width, height, room_type, cost, color)
+
+    def edit(self):
+        """
+        Group the edits made in a with-block into one undo step.
+
+        Usage:
+            with tower.edit():
+                tower.add_basements(1)
+                tower.resources.add("earth", 10)
+        """
+        return self.history.group()
+
+    def undo(self, steps=1):
+        """Undo the last steps edits. Returns how many were undone."""
+        return self.history.undo(self, steps)
+
+    def redo(self, steps=1):
+        """Redo up to steps undone edits. Returns how many were redone."""
+        return self.history.redo(self, steps)
+
+    def add_rooms(self, count, room_type="Room", color=(200, 200, 200), cost=0):
+        """Build count standard rooms on top of the tower in one batch."""
+        step = ROOM_HEIGHT + ROOM_SPACING
+        y = (self.rooms[-1].y if self.rooms else WORLD_HORIZON_Y) - step
+        self.stack(self.rooms, count, self.center_x - ROOM_WIDTH // 2, y, -step,
+                   ROOM_WIDTH, ROOM_HEIGHT, room_type, cost, color)
+
+    def add_basements(self, count, room_type="Basement", color=(100, 100, 100), cost=0):
+        """Dig count standard basements below the tower in one batch."""
+        step = ROOM_HEIGHT + ROOM_SPACING
+        y = self.basements[-1].y + step if self.basements else WORLD_HORIZON_Y + ROOM_SPACING
+        self.stack(self.basements, count, self.center_x - ROOM_WIDTH // 2, y, step,
+                   ROOM_WIDTH, ROOM_HEIGHT, room_type, cost, color)
+
+    def visible_rooms(self, camera):
+        """
+        Find the rooms and basements that intersect the camera view.
+
+        Returns:
+            tuple: (visible rooms, visible basements), each in build order.
+        """
+        room_slice, basement_slice = self.visible_slices(camera)
+        return self.rooms[room_slice], self.basements[basement_slice]
+
+    def visible_slices(self, camera):
+        """
+        Find the index ranges of rooms and basements inside the camera view.
+
+        The y columns double as the culling index: rooms stack upwards so
+        their y values descend, basements stack downwards and ascend. Binary
+        search over them keeps the cost tied to how many rooms are on screen
+        rather than to the size of the tower.
+
+        Returns:
+            tuple: (room slice, basement slice) into self.rooms and self.basements.
+        """
+        offset_y, zoom = camera.get()
+        top = WORLD_HORIZON_Y - offset_y    # World y at the top of the screen
+        bottom = top + HEIGHT / zoom        # World y at the bottom of the screen
+        # Rooms starting above this line end before the top of the screen
+        reach = top - max(self.rooms.max_height, self.basements.max_height)
+
+        room_ys, basement_ys = self.rooms.y, self.basements.y
+        rooms = slice(bisect_right(room_ys, -bottom, key=neg), bisect_left(room_ys, -reach, key=neg))
+        basements = slice(bisect_right(basement_ys, reach), bisect_left(basement_ys, bottom))
+        return rooms, basements
+
+    @property
+    def center_x(self):
+        """World x of the tower's vertical axis."""
+        return self.origin_x + WIDTH // 2
+
+    def is_empty(self):
+        return not self.rooms and not self.basements and not any(self.resources.to_dict().values())
+
+    @property
+    def version(self):
+        """Changes whenever a room is added or moved; compare to detect edits."""
+        return self.rooms.version + self.basements.version
+
+    @property
+    def height(self):
+        return self.rooms.total_height
+
+    @property
+    def depth(self):
+        return -self.basements.total_height
+
+    def get_peak(self):
+        return self.rooms[-1].y if self.rooms else WORLD_HORIZON_Y
+
+    def get_bottom(self):
+        last = self.basements[-1] if self.basements else None
+        return last.y + last.height if last else WORLD_HORIZON_Y
+
+
+def build_room(tower, count=1):
+    """Build rooms on top of the tower."""
+    with tower.edit():
+        tower.add_rooms(count)
+
+
+def dig_basement(tower, count=1):
+    """Dig basements below the tower, yielding earth."""
+    with tower.edit():
+        tower.add_basements(count)
+        tower.resources.add("earth", 10 * count)
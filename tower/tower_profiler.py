@@ -0,0 +1,104 @@
+import csv
+import time
+from collections import deque
+
+# Frame phases in the order the main loop runs them
+PHASES = ("events", "background", "rooms", "base", "ui")
+# Number of recent frames the rolling stats cover
+WINDOW = 240
+
+
+def _percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timer with rolling statistics.
+
+    The main loop calls start_frame(), mark(phase) after each phase and
+    end_frame(). While disabled, each of those returns immediately, so the
+    instrumentation costs only a few attribute checks per frame.
+    """
+
+    def __init__(self, phases=PHASES, window=WINDOW):
+        self.phases = phases
+        self.enabled = False
+        self._active = False
+        self._frames = deque(maxlen=window)      # Per-frame phase times in ms
+        self._intervals = deque(maxlen=window)   # Time between frame starts in ms
+        self._frame_start = None
+        self._last = 0.0
+        self._current = {}
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if not self.enabled:
+            self._frames.clear()
+            self._intervals.clear()
+            self._frame_start = None
+
+    def start_frame(self):
+        self._active = self.enabled
+        if not self._active:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._intervals.append((now - self._frame_start) * 1000.0)
+        self._frame_start = self._last = now
+        self._current = dict.fromkeys(self.phases, 0.0)
+
+    def mark(self, phase):
+        """Attribute the time since the previous mark to phase."""
+        if not self._active:
+            return
+        now = time.perf_counter()
+        self._current[phase] += (now - self._last) * 1000.0
+        self._last = now
+
+    def end_frame(self):
+        if not self._active:
+            return
+        self._frames.append(tuple(self._current[phase] for phase in self.phases))
+        self._active = False
+
+    def stats(self):
+        """
+        Rolling statistics over the recent window.
+
+        Returns:
+            dict: phase (plus "frame" for the total) -> (p50, p95, max) in ms.
+        """
+        result = {}
+        columns = list(zip(*self._frames)) if self._frames else [()] * len(self.phases)
+        totals = sorted(sum(frame) for frame in self._frames)
+        for phase, samples in zip(self.phases, columns):
+            samples = sorted(samples)
+            result[phase] = (_percentile(samples, 50), _percentile(samples, 95), samples[-1] if samples else 0.0)
+        result["frame"] = (_percentile(totals, 50), _percentile(totals, 95), totals[-1] if totals else 0.0)
+        return result
+
+    def fps(self):
+        """Achieved frames per second over the recent window."""
+        if not self._intervals:
+            return 0.0
+        return 1000.0 * len(self._intervals) / sum(self._intervals)
+
+    def lines(self, target_fps):
+        """Overlay text: one line for FPS and one per phase."""
+        lines = [f"fps: {self.fps():.1f} / {target_fps}   (p50 / p95 / max ms)"]
+        for phase, (p50, p95, worst) in self.stats().items():
+            lines.append(f"{phase:>10}: {p50:6.2f} {p95:6.2f} {worst:6.2f}")
+        return lines
+
+    def dump_csv(self, path):
+        """Write the current rolling stats to a CSV file."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "p50_ms", "p95_ms", "max_ms"])
+            for phase, values in self.stats().items():
+                writer.writerow([phase, *(f"{value:.4f}" for value in values)])
+            writer.writerow(["fps", f"{self.fps():.2f}", "", ""])
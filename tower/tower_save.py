@@ -0,0 +1,369 @@
+"""
+Binary save files for Tower state.
+
+A save is a snapshot plus an append-only journal next to it:
+
+- The snapshot (``<path>``) holds a fixed header, the resources, and for
+  each room store its type/color tables followed by fixed-width columns
+  (x, y, width, height, cost as int32, type and color ids as uint16, then
+  the run-length summary). Columns are stored contiguously, so loading is
+  one memory-mapped copy per column rather than per-room parsing.
+- The journal (``<path>.journal``) records build/dig (single rooms and
+  bulk stacks), removals from undo, and resource events as they happen. Autosave appends to it and only rewrites the snapshot
+  when the journal is compacted.
+
+Both files carry a generation number. A journal is replayed only when its
+generation matches the snapshot's, so a crash between writing a new
+snapshot and resetting the journal never applies events twice.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"WTWR"
+JOURNAL_MAGIC = b"WTJL"
+VERSION = 1
+
+RESOURCE_NAMES = ("mana", "earth", "wood", "stone", "gold")
+
+# magic, version, store count, generation, resource values
+HEADER = struct.Struct("<4sHHQ5q")
+# row count, type count, color count, run count, total height, max height
+STORE_HEADER = struct.Struct("<QHH4xQqi4x")
+# magic, version, padding, generation
+JOURNAL_HEADER = struct.Struct("<4sH2xQ")
+
+# Journal records start with an opcode byte
+OP_ROOM = 1
+OP_RESOURCE = 2
+OP_STACK = 3
+OP_REMOVE = 4
+# op, store, x, y, width, height, cost, r, g, b, type name length
+ROOM_RECORD = struct.Struct("<BBiiiiiBBBH")
+# op, store, count, x, y, step, width, height, cost, r, g, b, type name length
+STACK_RECORD = struct.Struct("<BBqiiiiiiBBBH")
+# op, store, first row, row count
+REMOVE_RECORD = struct.Struct("<BBqq")
+# op, resource index, delta
+RESOURCE_RECORD = struct.Struct("<BBq")
+
+# Fold the journal into a new snapshot after this many events
+COMPACT_EVERY = 10_000
+
+ROW_TYPECODES = ("i", "i", "i", "i", "i", "H", "H")
+RUN_TYPECODES = ("i", "H", "H")
+
+
+def _stores(tower):
+    return (tower.rooms, tower.basements)
+
+
+def _pad(length, alignment=8):
+    return -length % alignment
+
+
+def write_array(f, values):
+    """Write an array little-endian, padded to 8 bytes."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+    f.write(b"\0" * _pad(len(values) * values.itemsize))
+
+
+def read_array(buffer, offset, typecode, count):
+    """
+    Read an array written by write_array.
+
+    Returns:
+        tuple: The array and the offset just past its padding.
+    """
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    values.frombytes(buffer[offset:end])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, end + _pad(end - offset)
+
+
+def write_tables(f, types, colors):
+    """Write room type names and RGB colors, padded to 8 bytes."""
+    table = bytearray()
+    for room_type in types:
+        name = room_type.encode("utf-8")
+        table += struct.pack("<H", len(name)) + name
+    for color in colors:
+        table += bytes(color[:3])
+    f.write(table + b"\0" * _pad(len(table)))
+
+
+def read_tables(buffer, offset, type_count, color_count):
+    """
+    Read tables written by write_tables.
+
+    Returns:
+        tuple: (types, colors, offset just past the padding).
+    """
+    start = offset
+    types = []
+    for _ in range(type_count):
+        (length,) = struct.unpack_from("<H", buffer, offset)
+        types.append(bytes(buffer[offset + 2:offset + 2 + length]).decode("utf-8"))
+        offset += 2 + length
+    colors = [tuple(buffer[offset + 3 * i:offset + 3 * i + 3]) for i in range(color_count)]
+    offset += 3 * color_count
+    return types, colors, offset + _pad(offset - start)
+
+
+def save_tower(tower, path, generation=0):
+    """
+    Write a full snapshot of the tower to path, replacing it atomically.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        resources = [getattr(tower.resources, name) for name in RESOURCE_NAMES]
+        stores = _stores(tower)
+        f.write(HEADER.pack(MAGIC, VERSION, len(stores), generation, *resources))
+        for store in stores:
+            f.write(STORE_HEADER.pack(len(store), len(store.types), len(store.colors), len(store.run_start),
+                                      store.total_height, store.max_height))
+            write_tables(f, store.types, store.colors)
+            for column in store.columns():
+                write_array(f, column)
+            for column in (store.run_start, store.run_type, store.run_color):
+                write_array(f, column)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_tower(path, tower):
+    """
+    Load a snapshot into an empty tower.
+
+    Returns:
+        int: The snapshot's generation number.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        magic, version, store_count, generation, *resources = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tower save file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported tower save version {version}")
+        for name, value in zip(RESOURCE_NAMES, resources):
+            setattr(tower.resources, name, value)
+        tower.resources.changed = True
+
+        offset = HEADER.size
+        for store in _stores(tower)[:store_count]:
+            rows, type_count, color_count, run_count, total_height, max_height = STORE_HEADER.unpack_from(buffer, offset)
+            offset += STORE_HEADER.size
+            types, colors, offset = read_tables(buffer, offset, type_count, color_count)
+
+            columns = []
+            for typecode in ROW_TYPECODES:
+                column, offset = read_array(buffer, offset, typecode, rows)
+                columns.append(column)
+            runs = []
+            for typecode in RUN_TYPECODES:
+                column, offset = read_array(buffer, offset, typecode, run_count)
+                runs.append(column)
+            store.load(tuple(columns), types, colors, tuple(runs), total_height, max_height)
+    return generation
+
+
+class Journal:
+    """
+    Append-only log of tower edits since the last snapshot.
+    """
+
+    def __init__(self, path, generation):
+        self.path = path
+        self.generation = generation
+        self.events = 0
+        self._file = None
+
+    def reset(self, generation):
+        """Start an empty journal for the given snapshot generation."""
+        self.close()
+        self.generation = generation
+        self.events = 0
+        self._file = open(self.path, "wb")
+        self._file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, generation))
+        self._file.flush()
+
+    def open_for_append(self):
+        """Keep appending to a journal that was just replayed."""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+
+    def write_room(self, store_index, room):
+        name = room.type.encode("utf-8")
+        r, g, b = room.color[:3]
+        self._file.write(ROOM_RECORD.pack(OP_ROOM, store_index, room.x, room.y, room.width,
+                                          room.height, room.cost, r, g, b, len(name)) + name)
+        self.events += 1
+
+    def write_stack(self, store_index, count, x, y, step, width, height, room_type, cost, color):
+        name = room_type.encode("utf-8")
+        r, g, b = color[:3]
+        self._file.write(STACK_RECORD.pack(OP_STACK, store_index, count, x, y, step, width,
+                                           height, cost, r, g, b, len(name)) + name)
+        self.events += 1
+
+    def write_remove(self, store_index, index, count):
+        self._file.write(REMOVE_RECORD.pack(OP_REMOVE, store_index, index, count))
+        self.events += 1
+
+    def write_resource(self, name, delta):
+        self._file.write(RESOURCE_RECORD.pack(OP_RESOURCE, RESOURCE_NAMES.index(name), delta))
+        self.events += 1
+
+    def replay(self, tower):
+        """
+        Apply the journal's events to a tower loaded from the matching snapshot.
+
+        Returns:
+            int: Number of events applied, or None when the journal belongs
+            to a different snapshot generation and was ignored.
+        """
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if len(data) < JOURNAL_HEADER.size:
+            return None
+        magic, version, generation = JOURNAL_HEADER.unpack_from(data, 0)
+        if magic != JOURNAL_MAGIC or version != VERSION or generation != self.generation:
+            return None
+
+        stores = _stores(tower)
+        offset, events = JOURNAL_HEADER.size, 0
+        while offset < len(data):
+            op = data[offset]
+            if op == OP_ROOM and offset + ROOM_RECORD.size <= len(data):
+                _, store_index, x, y, width, height, cost, r, g, b, length = ROOM_RECORD.unpack_from(data, offset)
+                offset += ROOM_RECORD.size
+                if offset + length > len(data):
+                    break   # Torn write at the end of the journal
+                room_type = data[offset:offset + length].decode("utf-8")
+                offset += length
+                room = stores[store_index].view(x, y, width, height, room_type, cost, (r, g, b))
+                (tower.add_room if store_index == 0 else tower.add_basement)(room)
+            elif op == OP_STACK and offset + STACK_RECORD.size <= len(data):
+                _, store_index, count, x, y, step, width, height, cost, r, g, b, length = STACK_RECORD.unpack_from(data, offset)
+                offset += STACK_RECORD.size
+                if offset + length > len(data):
+                    break
+                room_type = data[offset:offset + length].decode("utf-8")
+                offset += length
+                tower.stack(stores[store_index], count, x, y, step, width, height, room_type, cost, (r, g, b))
+            elif op == OP_REMOVE and offset + REMOVE_RECORD.size <= len(data):
+                _, store_index, index, count = REMOVE_RECORD.unpack_from(data, offset)
+                offset += REMOVE_RECORD.size
+                tower.remove_rows(stores[store_index], index, count)
+            elif op == OP_RESOURCE and offset + RESOURCE_RECORD.size <= len(data):
+                _, resource, delta = RESOURCE_RECORD.unpack_from(data, offset)
+                offset += RESOURCE_RECORD.size
+                tower.resources.add(RESOURCE_NAMES[resource], delta)
+            else:
+                break
+            events += 1
+        # Drop any torn record so new events are appended after valid data
+        if offset < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self.events = events
+        return events
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Autosave:
+    """
+    Keeps a tower persisted by journaling each edit and compacting periodically.
+
+    Usage:
+        autosave = Autosave("tower.save")
+        autosave.open(tower)    # load existing state, start journaling
+        ...
+        autosave.close()        # fold the journal into the snapshot
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self.tower = None
+        self.journal = Journal(path + ".journal", 0)
+        self.saved_at = None  # When the loaded state was last written, as a timestamp
+
+    def open(self, tower):
+        """
+        Load the saved state into an empty tower and attach to it.
+        """
+        generation = 0
+        saved = [os.path.getmtime(p) for p in (self.path, self.journal.path) if os.path.exists(p)]
+        self.saved_at = max(saved) if saved else None
+        if os.path.exists(self.path):
+            generation = load_tower(self.path, tower)
+        self.journal.generation = generation
+
+        replayed = self.journal.replay(tower) if os.path.exists(self.journal.path) else None
+        if replayed is None:
+            # No journal, or one from another generation that is already folded in
+            self.journal.reset(generation)
+        else:
+            self.journal.open_for_append()
+
+        # Loading is not an edit the player can undo
+        tower.history.clear()
+        self.tower = tower
+        tower.journal = self
+        tower.resources.journal = self
+        return tower
+
+    def room_added(self, store_index, room):
+        self.journal.write_room(store_index, room)
+        self._maybe_compact()
+
+    def rooms_stacked(self, store_index, count, x, y, step, width, height, room_type, cost, color):
+        self.journal.write_stack(store_index, count, x, y, step, width, height, room_type, cost, color)
+        self._maybe_compact()
+
+    def rooms_removed(self, store_index, index, count):
+        self.journal.write_remove(store_index, index, count)
+        self._maybe_compact()
+
+    def resource_changed(self, name, delta):
+        self.journal.write_resource(name, delta)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self.journal.events >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Write a fresh snapshot and start an empty journal."""
+        generation = self.journal.generation + 1
+        self.journal.flush()
+        save_tower(self.tower, self.path, generation)
+        self.journal.reset(generation)
+
+    def flush(self):
+        self.journal.flush()
+
+    def close(self):
+        if self.tower is not None:
+            if self.journal.events:
+                # Nothing to fold in otherwise; the snapshot is already current
+                self.compact()
+            self.tower.journal = None
+            self.tower.resources.journal = None
+        self.journal.close()
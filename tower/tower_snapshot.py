@@ -0,0 +1,77 @@
+import math
+import time
+
+import pygame
+
+
+class WorldSnapshot:
+    """
+    Copy of the last fully rendered world layer, for cheap animation frames.
+
+    While the camera eases between two views, each frame scales and shifts
+    this copy instead of redrawing every room. The real scene is drawn again
+    once the camera settles.
+
+    Scaling a full screen has a fixed cost, so the copy is only worth using
+    while drawing the world for real is slower; both times are tracked.
+    """
+
+    def __init__(self):
+        self.surface = None
+        self.state = None   # Camera (offset_x, offset_y, zoom) the copy was taken at
+        self.render_seconds = 0.0   # Time the last full world draw took
+        self.draw_seconds = 0.0     # Time the last scaled draw of the copy took
+
+    def __bool__(self):
+        return self.surface is not None
+
+    def worth_using(self):
+        return self.surface is not None and self.render_seconds > self.draw_seconds
+
+    def capture(self, surface, camera, render_seconds):
+        """
+        Record the world just drawn to surface, before the UI goes on top.
+
+        A full-screen draw replaces the copy; a clipped redraw at the same
+        camera state patches just the clipped area into it.
+
+        Args:
+            render_seconds (float): How long drawing the world took.
+        """
+        state = (camera.offset_x, camera.offset_y, camera.zoom)
+        clip = surface.get_clip()
+        if self.surface is not None and self.state == state:
+            self.surface.blit(surface, clip, clip)
+        elif clip == surface.get_rect():
+            self.surface = surface.copy()
+            self.surface.set_clip(None)
+            self.state = state
+            self.render_seconds = render_seconds
+        else:
+            # Only part of a new view was drawn; the copy can't be completed
+            self.surface = None
+
+    def draw(self, surface, camera):
+        """
+        Draw the copy as seen from the camera's current state.
+
+        Only the part of the copy that lands on screen is scaled, so the
+        cost stays bounded however far the camera zooms in.
+        """
+        start = time.perf_counter()
+        offset_x, offset_y, zoom = self.state
+        scale = camera.zoom / zoom
+        dx = (camera.offset_x - offset_x) * camera.zoom
+        dy = (camera.offset_y - offset_y) * camera.zoom
+        width, height = self.surface.get_size()
+        out_width, out_height = surface.get_size()
+
+        left = max(0, math.floor(-dx / scale))
+        top = max(0, math.floor(-dy / scale))
+        right = min(width, math.ceil((out_width - dx) / scale))
+        bottom = min(height, math.ceil((out_height - dy) / scale))
+        if right > left and bottom > top:
+            source = self.surface.subsurface((left, top, right - left, bottom - top))
+            size = (math.ceil((right - left) * scale), math.ceil((bottom - top) * scale))
+            surface.blit(pygame.transform.scale(source, size), (round(left * scale + dx), round(top * scale + dy)))
+        self.draw_seconds = time.perf_counter() - start
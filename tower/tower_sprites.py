@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+import pygame
+
+from tower_labels import LABELS
+
+# How many on-screen room sizes to keep sprites for. Continuous zooming
+# walks through many sizes; only the most recently used ones survive.
+MAX_ZOOM_BUCKETS = 8
+
+
+class SpriteCache:
+    """
+    Pre-composed room sprites (filled rectangle plus centered label).
+
+    Sprites are grouped into buckets by their on-screen pixel size, which is
+    the room size quantized by the current zoom. Within a bucket they are
+    keyed by (room type, color). When more than max_buckets sizes are in
+    use, the least recently used bucket is dropped as a whole.
+    """
+
+    def __init__(self, max_buckets=MAX_ZOOM_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+
+    def get(self, font, room_type, color, width, height, zoom, text_color=(0, 0, 0)):
+        """
+        Return the sprite for a room drawn at width x height pixels.
+
+        Args:
+            font (pygame.font.Font): Font for the room label, or None.
+            room_type (str): Label text; empty for no label.
+            color (tuple): Fill color.
+            width (int): Sprite width in pixels.
+            height (int): Sprite height in pixels.
+            zoom (float): Camera zoom, used to scale the label.
+        """
+        size = (width, height)
+        bucket = self._buckets.get(size)
+        if bucket is None:
+            bucket = self._buckets[size] = {}
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(size)
+
+        key = (room_type, color)
+        sprite = bucket.get(key)
+        if sprite is None:
+            sprite = bucket[key] = self._compose(font, room_type, color, size, zoom, text_color)
+        return sprite
+
+    def _compose(self, font, room_type, color, size, zoom, text_color):
+        sprite = pygame.Surface(size)
+        sprite.fill(color)
+        if font and room_type:
+            label = LABELS.render(font, room_type, text_color, zoom)
+            # Labels taller than the room would be clipped beyond reading
+            if label.get_height() <= size[1]:
+                sprite.blit(label, label.get_rect(center=sprite.get_rect().center))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        return sprite
+
+    def clear(self):
+        self._buckets.clear()
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+
+# Shared by every room renderer
+SPRITES = SpriteCache()
@@ -0,0 +1,279 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class RoomView:
+    """
+    A lightweight handle on one row of a RoomStore.
+
+    Constructing a RoomView directly creates a detached one-row store, so
+    rooms can still be built up front and handed to Tower.add_room.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, x=0, y=0, width=120, height=40, room_type="Empty room", cost=0, color=(200, 200, 200)):
+        self._store = RoomStore(type(self))
+        self._store.append(x, y, width, height, room_type, cost, color)
+        self._index = 0
+
+    @classmethod
+    def at(cls, store, index):
+        """Create a view on an existing row without copying it."""
+        view = cls.__new__(cls)
+        view._store = store
+        view._index = index
+        return view
+
+    @property
+    def x(self):
+        return self._store.x[self._index]
+
+    @x.setter
+    def x(self, value):
+        self._store.x[self._index] = value
+        self._store.version += 1
+
+    @property
+    def y(self):
+        return self._store.y[self._index]
+
+    @y.setter
+    def y(self, value):
+        self._store.y[self._index] = value
+        self._store.version += 1
+
+    @property
+    def width(self):
+        return self._store.width[self._index]
+
+    @property
+    def height(self):
+        return self._store.height[self._index]
+
+    @property
+    def type(self):
+        return self._store.types[self._store.type_id[self._index]]
+
+    @property
+    def color(self):
+        return self._store.colors[self._store.color_id[self._index]]
+
+    @property
+    def cost(self):
+        return self._store.cost[self._index]
+
+    @property
+    def rect(self):
+        """A pygame.Rect copy of the room's bounds."""
+        import pygame
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def __eq__(self, other):
+        return isinstance(other, RoomView) and self._store is other._store and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._store), self._index))
+
+
+class RoomStore:
+    """
+    Column-oriented storage for rooms.
+
+    Each room is a row across parallel typed arrays (x, y, width, height,
+    cost, type id, color id) instead of a Python object with its own Rect.
+    Room types and colors are interned into small lookup tables. Indexing
+    the store returns views of the given view class.
+
+    A run-length summary of consecutive rows sharing a type and color is
+    kept up to date as rows are added, for low-detail rendering.
+    """
+
+    def __init__(self, view=RoomView):
+        self.view = view
+        self.x = array("i")
+        self.y = array("i")
+        self.width = array("i")
+        self.height = array("i")
+        self.cost = array("i")
+        self.type_id = array("H")
+        self.color_id = array("H")
+        self.types = []
+        self.colors = []
+        self._type_ids = {}
+        self._color_ids = {}
+        self.total_height = 0   # Running sum of room heights
+        self.max_height = 0     # Tallest room, used to pad culling queries
+        self.version = 0        # Bumped on every edit, so derived values can be cached
+        self.type_counts = array("q")  # Rooms per type id
+        # Runs of identical rooms: first row index, type id and color id
+        self.run_start = array("i")
+        self.run_type = array("H")
+        self.run_color = array("H")
+
+    def columns(self):
+        """The row columns in storage order: x, y, width, height, cost, type id, color id."""
+        return (self.x, self.y, self.width, self.height, self.cost, self.type_id, self.color_id)
+
+    def intern_type(self, room_type):
+        """Return the id for a room type, adding it to the table if needed."""
+        type_id = self._type_ids.get(room_type)
+        if type_id is None:
+            type_id = self._type_ids[room_type] = len(self.types)
+            self.types.append(room_type)
+            self.type_counts.append(0)
+        return type_id
+
+    def intern_color(self, color):
+        """Return the id for a color, adding it to the table if needed."""
+        color = tuple(color)
+        color_id = self._color_ids.get(color)
+        if color_id is None:
+            color_id = self._color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        return color_id
+
+    def _extend_runs(self, start, type_id, color_id):
+        """Record that rows from start onwards have the given type and color."""
+        if self.run_start and self.run_type[-1] == type_id and self.run_color[-1] == color_id:
+            return
+        self.run_start.append(start)
+        self.run_type.append(type_id)
+        self.run_color.append(color_id)
+
+    def _rebuild_runs(self):
+        self.run_start = array("i")
+        self.run_type = array("H")
+        self.run_color = array("H")
+        for i, (type_id, color_id) in enumerate(zip(self.type_id, self.color_id)):
+            self._extend_runs(i, type_id, color_id)
+
+    def runs(self, rows):
+        """
+        Yield the runs of identical rooms that overlap a slice of rows.
+
+        Yields:
+            tuple: (first row, end row, type id, color id), clipped to rows.
+        """
+        start, stop, _ = rows.indices(len(self))
+        if start >= stop:
+            return
+        first = bisect_right(self.run_start, start) - 1
+        last = bisect_left(self.run_start, stop)
+        for run in range(first, last):
+            run_end = self.run_start[run + 1] if run + 1 < len(self.run_start) else len(self)
+            yield max(start, self.run_start[run]), min(stop, run_end), self.run_type[run], self.run_color[run]
+
+    def append(self, x, y, width, height, room_type, cost, color):
+        """Append a single room row."""
+        self.insert(len(self), x, y, width, height, room_type, cost, color)
+
+    def insert(self, index, x, y, width, height, room_type, cost, color):
+        """Insert a single room row before index."""
+        row = (x, y, width, height, cost, self.intern_type(room_type), self.intern_color(color))
+        for column, value in zip(self.columns(), row):
+            column.insert(index, value)
+        self.total_height += height
+        self.max_height = max(self.max_height, height)
+        self.type_counts[row[5]] += 1
+        self.version += 1
+        if index == len(self) - 1:
+            self._extend_runs(index, row[5], row[6])
+        else:
+            self._rebuild_runs()
+
+    def extend_stacked(self, count, x, y, step, width, height, room_type, cost, color):
+        """
+        Append count identical rooms whose y positions advance by step.
+
+        The columns are extended in bulk, so the Python-level work does not
+        depend on count.
+        """
+        if count <= 0:
+            return
+        self._extend_runs(len(self), self.intern_type(room_type), self.intern_color(color))
+        self.x.extend(array("i", [x]) * count)
+        self.y.extend(range(y, y + step * count, step))
+        self.width.extend(array("i", [width]) * count)
+        self.height.extend(array("i", [height]) * count)
+        self.cost.extend(array("i", [cost]) * count)
+        self.type_id.extend(array("H", [self.intern_type(room_type)]) * count)
+        self.color_id.extend(array("H", [self.intern_color(color)]) * count)
+        self.total_height += height * count
+        self.max_height = max(self.max_height, height)
+        self.type_counts[self.intern_type(room_type)] += count
+        self.version += 1
+
+    def delete(self, index, count):
+        """
+        Remove count rows starting at index.
+
+        Removing rows from the end, the common case when undoing, keeps the
+        run summary by trimming it; removing from the middle rebuilds it.
+        max_height is left as is: it only pads culling queries, so an upper
+        bound is enough and avoids rescanning the store.
+        """
+        end = min(len(self), index + count)
+        if index < 0 or end <= index:
+            return
+        for first, stop, type_id, _ in self.runs(slice(index, end)):
+            self.type_counts[type_id] -= stop - first
+        self.total_height -= sum(self.height[index:end])
+        at_end = end == len(self)
+        for column in self.columns():
+            del column[index:end]
+        if at_end:
+            keep = bisect_left(self.run_start, index)
+            del self.run_start[keep:], self.run_type[keep:], self.run_color[keep:]
+        else:
+            self._rebuild_runs()
+        self.version += 1
+
+    def load(self, columns, types, colors, runs, total_height=None, max_height=None):
+        """
+        Replace the store's contents with prebuilt columns, e.g. from a save file.
+
+        Args:
+            columns (tuple): Arrays in the order returned by columns().
+            types (list): Room type table.
+            colors (list): Color table.
+            runs (tuple): run_start, run_type and run_color arrays.
+            total_height (int): Precomputed sum of heights, if known.
+            max_height (int): Precomputed tallest room, if known.
+        """
+        self.x, self.y, self.width, self.height, self.cost, self.type_id, self.color_id = columns
+        self.run_start, self.run_type, self.run_color = runs
+        self.types = list(types)
+        self.colors = [tuple(color) for color in colors]
+        self._type_ids = {room_type: i for i, room_type in enumerate(self.types)}
+        self._color_ids = {color: i for i, color in enumerate(self.colors)}
+        self.total_height = sum(self.height) if total_height is None else total_height
+        self.max_height = max(self.height, default=0) if max_height is None else max_height
+        self.type_counts = array("q", [0] * len(self.types))
+        for first, end, type_id, _ in self.runs(slice(None)):
+            self.type_counts[type_id] += end - first
+        self.version += 1
+
+    def count_by_type(self):
+        """Map each room type to how many rooms of that type the store holds."""
+        return dict(zip(self.types, self.type_counts))
+
+    def nbytes(self):
+        """Memory used by the row columns in bytes."""
+        return sum(column.itemsize * len(column) for column in self.columns())
+
+    def __len__(self):
+        return len(self.y)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.view.at(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("room index out of range")
+        return self.view.at(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.view.at(self, i)
@@ -1,5 +1,6 @@
 import pygame
-from tower_config import BUTTON_COLOR, TEXT_COLOR, FONT
+from tower_config import BUTTON_COLOR, TEXT_COLOR, get_font
+from tower_labels import LABELS
 
 class Button:
     def __init__(self, x, y, w, h, text):
@@ -8,14 +9,20 @@ class Button:
 
     def draw(self, surface):
         pygame.draw.rect(surface, BUTTON_COLOR, self.rect)
-        label = FONT.render(self.text, True, TEXT_COLOR)
+        label = LABELS.render(get_font(), self.text, TEXT_COLOR)
         surface.blit(label, (self.rect.x + 5, self.rect.y + 10))
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
 
+# resource -> (amount, rendered label); counters only re-render when their value changes
+_resource_labels = {}
+
 def draw_resources(surface, resources, x=20, y=20):
     for resource, amount in resources.items():
-        label = FONT.render(f"{resource}: {amount}", True, TEXT_COLOR)
-        surface.blit(label, (x, y))
-        y += 30
\ No newline at end of file
+        cached = _resource_labels.get(resource)
+        if cached is None or cached[0] != amount:
+            cached = (amount, get_font().render(f"{resource}: {amount}", True, TEXT_COLOR))
+            _resource_labels[resource] = cached
+        surface.blit(cached[1], (x, y))
+        y += 30
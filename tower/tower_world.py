@@ -0,0 +1,170 @@
+"""
+A horizontal world of tower plots, streamed from disk in chunks.
+
+The world is split into CHUNK_WIDTH-wide chunks along x, each holding one
+tower. Only the chunks around the camera's view stay in memory; the rest
+live on disk as ordinary tower saves (``chunk_<index>.tower`` plus its
+journal) and are loaded back when they scroll into view. Memory therefore
+depends on how many chunks are resident, never on how far the player has
+scrolled.
+
+Every resident chunk runs its own economy. A chunk coming back from disk
+is first caught up for the time since its save was written, so towers
+keep earning while they are out of view.
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+
+from tower_config import CHUNK_WIDTH, CHUNK_MARGIN, MAX_RESIDENT_CHUNKS
+from tower_economy import Economy, TICK_SECONDS
+from tower_model import Tower
+from tower_save import Autosave
+
+
+class Chunk:
+    """
+    One resident chunk: its tower, the economy running it and the autosave
+    persisting it.
+    """
+
+    __slots__ = ("index", "tower", "economy", "autosave")
+
+    def __init__(self, index, tower, economy, autosave):
+        self.index = index
+        self.tower = tower
+        self.economy = economy
+        self.autosave = autosave
+
+
+class World:
+    """
+    Keeps the chunks near the camera loaded and the rest on disk.
+
+    Args:
+        directory (str): Folder holding one save per chunk.
+        max_resident (int): Most chunks kept in memory at once.
+        margin (int): Chunks kept loaded beyond each edge of the view.
+    """
+
+    def __init__(self, directory, max_resident=MAX_RESIDENT_CHUNKS, margin=CHUNK_MARGIN):
+        self.directory = directory
+        self.max_resident = max(1, max_resident)
+        self.margin = margin
+        self.chunks = OrderedDict()   # index -> Chunk, least recently used first
+        self.loads = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def chunk_path(self, index):
+        return os.path.join(self.directory, f"chunk_{index}.tower")
+
+    @staticmethod
+    def chunk_index(x):
+        """Index of the chunk containing world x."""
+        return math.floor(x / CHUNK_WIDTH)
+
+    def chunk(self, index):
+        """
+        Get a chunk, loading it from disk (or creating it) if needed.
+
+        Returns:
+            Chunk: The resident chunk.
+        """
+        chunk = self.chunks.get(index)
+        if chunk is not None:
+            self.chunks.move_to_end(index)
+            return chunk
+        tower = Tower(origin_x=index * CHUNK_WIDTH)
+        autosave = Autosave(self.chunk_path(index))
+        autosave.open(tower)
+        economy = Economy(tower)
+        if autosave.saved_at:
+            # Progress while the chunk was on disk
+            economy.catch_up(time.time() - autosave.saved_at)
+        chunk = self.chunks[index] = Chunk(index, tower, economy, autosave)
+        self.loads += 1
+        return chunk
+
+    def tower_at(self, x):
+        """The tower whose plot contains world x."""
+        return self.chunk(self.chunk_index(x)).tower
+
+    def wanted(self, camera):
+        """
+        Chunk indices that should be resident for the camera's view, nearest
+        to the view center first and capped at max_resident.
+        """
+        left, right = camera.view_span()
+        first = self.chunk_index(left) - self.margin
+        last = self.chunk_index(right) + self.margin
+        center = camera.center_x() / CHUNK_WIDTH - 0.5
+        # Walk outward from the center chunk, so the cost depends on
+        # max_resident rather than on how wide a zoomed-out view is
+        nearest = min(max(math.ceil(center - 0.5), first), last)
+        indices = [nearest]
+        below, above = nearest - 1, nearest + 1
+        while len(indices) < self.max_resident and (below >= first or above <= last):
+            if above > last or (below >= first and center - below <= above - center):
+                indices.append(below)
+                below -= 1
+            else:
+                indices.append(above)
+                above += 1
+        return indices
+
+    def stream(self, camera):
+        """
+        Load the chunks the camera needs and evict the ones it no longer does.
+
+        Returns:
+            bool: True when any chunk was loaded or evicted.
+        """
+        wanted = self.wanted(camera)
+        changed = False
+        for index in wanted:
+            if index not in self.chunks:
+                changed = True
+            self.chunk(index)
+        keep = set(wanted)
+        for index in [index for index in self.chunks if index not in keep]:
+            self.evict(index)
+            changed = True
+        return changed
+
+    def evict(self, index):
+        """Write a chunk back to disk and drop it from memory."""
+        chunk = self.chunks.pop(index)
+        empty = chunk.tower.is_empty()
+        chunk.autosave.close()
+        if empty:
+            # Nothing built here; don't leave a file for every plot scrolled past
+            for path in (chunk.autosave.path, chunk.autosave.journal.path):
+                if os.path.exists(path):
+                    os.remove(path)
+        self.evictions += 1
+
+    def update(self, dt):
+        """Advance every resident tower's economy by dt seconds."""
+        for chunk in self.chunks.values():
+            chunk.economy.update(dt)
+
+    def seconds_until_next_tick(self):
+        """Time until the next economy tick of any resident tower."""
+        return min((chunk.economy.seconds_until_next_tick() for chunk in self.chunks.values()),
+                   default=TICK_SECONDS)
+
+    def visible_towers(self, camera):
+        """Resident towers whose plots overlap the camera's view, left to right."""
+        left, right = camera.view_span()
+        first, last = self.chunk_index(left), self.chunk_index(right)
+        return [self.chunks[i].tower for i in sorted(self.chunks) if first <= i <= last]
+
+    def flush(self):
+        for chunk in self.chunks.values():
+            chunk.autosave.flush()
+
+    def close(self):
+        for index in list(self.chunks):
+            self.evict(index)